@@ -1,9 +1,8 @@
-import requests
 import pandas as pd
 from datetime import datetime
-import time
 from loguru import logger
 import os
+from draw_api import DrawFetchError, fetch_draw, fetch_draws, cache_stats, backfill_rate_limiter
 
 def get_latest_drw_no():
     """현재 최신 회차 번호를 계산합니다."""
@@ -13,55 +12,112 @@ def get_latest_drw_no():
     return diff.days // 7 + 1
 
 def fetch_lotto_data(drw_no):
-    """특정 회차의 로또 데이터를 가져옵니다."""
-    url = f"https://www.dhlottery.co.kr/common.do?method=getLottoNumber&drwNo={drw_no}"
-    try:
-        res = requests.get(url, timeout=3)
-        data = res.json()
-        if data.get("returnValue") == "success":
-            return {
-                "drwNo": data["drwNo"],
-                "date": data["drwNoDate"],
-                "num1": data["drwtNo1"],
-                "num2": data["drwtNo2"],
-                "num3": data["drwtNo3"],
-                "num4": data["drwtNo4"],
-                "num5": data["drwtNo5"],
-                "num6": data["drwtNo6"],
-                "bonus": data["bnusNo"]
-            }
-        else:
-            return None
-    except Exception as e:
-        logger.error(f"회차 {drw_no} 조회 실패: {e}")
-        return None
+    """특정 회차의 로또 데이터를 가져옵니다. (공용 세션/속도 제한 사용)"""
+    return fetch_draw(drw_no)
+
+HISTORY_COLUMNS = ["drwNo", "date", "num1", "num2", "num3", "num4", "num5", "num6", "bonus"]
+
+def load_history(filename="lotto_history.csv"):
+    """저장된 CSV를 읽습니다. 파일이 없으면 빈 DataFrame을 반환합니다."""
+    if not os.path.exists(filename):
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+    df = pd.read_csv(filename, encoding='utf-8-sig')
+    return df.sort_values('drwNo').reset_index(drop=True)
+
+def write_history_atomic(df, filename):
+    """임시 파일에 쓴 뒤 교체하여, 중간에 중단되어도 깨진 CSV가 남지 않게 합니다."""
+    tmp_path = filename + ".tmp"
+    df.to_csv(tmp_path, index=False, encoding='utf-8-sig')
+    os.replace(tmp_path, filename)
+
+def fetch_all_history(filename="lotto_history.csv", incremental=True, checkpoint_every=50):
+    """
+    당첨번호를 수집하여 CSV로 저장합니다.
+
+    Args:
+        filename (str): 저장할 CSV 경로
+        incremental (bool): True면 CSV의 마지막 drwNo 이후 회차만 받아 뒤에 추가.
+            False면 1회부터 전체를 다시 수집.
+        checkpoint_every (int): 이 회차 수마다 진행분을 '<filename>.partial'에 저장.
+            수집이 중단되면 다음 실행 시 partial 파일의 마지막 회차부터 이어받는다.
+
+    조회 오류로 중단되었거나 수집분이 기존 CSV의 마지막 회차에 못 미치면 CSV는 그대로 두고
+    '.partial'에만 저장한다. (짧은 이력이 완전한 CSV를 덮어쓰지 않도록)
+    """
+    partial_path = filename + ".partial"
 
-def fetch_all_history(filename="lotto_history.csv"):
-    """1회부터 최신 회차까지 모든 데이터를 수집하여 CSV로 저장합니다."""
+    if os.path.exists(partial_path):
+        df = load_history(partial_path)
+        logger.info(f"이전 수집 중단 지점부터 재개합니다 ({partial_path}, {len(df)}행)")
+    elif incremental:
+        df = load_history(filename)
+    else:
+        df = pd.DataFrame(columns=HISTORY_COLUMNS)
+
+    last_drw = int(df['drwNo'].max()) if len(df) else 0
     latest_drw = get_latest_drw_no()
-    logger.info(f"데이터 수집 시작 (1회 ~ {latest_drw}회)")
-    
-    all_data = []
-    
-    # 기존 데이터가 있다면 로드해서 중복 방지 (선택 사항)
-    # 여기서는 덮어쓰기 모드로 진행
-    
-    for drw_no in range(1, latest_drw + 1):
-        data = fetch_lotto_data(drw_no)
-        if data:
-            all_data.append(data)
-            if drw_no % 100 == 0:
-                logger.info(f"{drw_no}회차 수집 완료...")
+    logger.info(f"데이터 수집 시작 ({last_drw + 1}회 ~ {latest_drw}회)")
+
+    pending = []
+    fetched = 0
+
+    def flush(path):
+        nonlocal df, pending
+        if pending:
+            new_df = pd.DataFrame(pending, columns=HISTORY_COLUMNS)
+            df = new_df if df.empty else pd.concat([df, new_df], ignore_index=True)
+            pending = []
+        write_history_atomic(df, path)
+
+    # checkpoint_every 회차씩 묶어 동시 조회 (순서 보장, 백필용 속도 제한으로 서버 부하 방지)
+    failed = False
+    for chunk_start in range(last_drw + 1, latest_drw + 1, checkpoint_every):
+        chunk = range(chunk_start, min(chunk_start + checkpoint_every, latest_drw + 1))
+        try:
+            results = fetch_draws(chunk, raise_errors=True, rate_limiter=backfill_rate_limiter)
+        except DrawFetchError as e:
+            # 네트워크/HTTP 오류 — 받은 회차는 디스크 캐시에 남으므로 다음 실행 때 이어받음
+            logger.error(f"{e}. 수집을 중단합니다.")
+            failed = True
+            break
+        stopped = False
+        for drw_no, data in zip(chunk, results):
+            if not data:
+                # 아직 추첨 전 — 회차는 연속이어야 하므로 여기서 멈춤
+                logger.info(f"{drw_no}회차는 아직 발표되지 않았습니다.")
+                stopped = True
+                break
+            pending.append(data)
+            fetched += 1
+        if stopped:
+            break
+        if pending and chunk[-1] < latest_drw:
+            flush(partial_path)
+            logger.info(f"{chunk[-1]}회차까지 수집 (체크포인트 저장)")
+
+    logger.info(f"회차 조회 캐시 통계: {cache_stats()}")
+    if fetched == 0 and not os.path.exists(partial_path):
+        if failed:
+            logger.warning(f"새 회차를 받지 못했습니다. 다음 실행 때 다시 시도합니다. (최신 {last_drw}회)")
         else:
-            logger.warning(f"{drw_no}회차 데이터 없음")
-        
-        # 서버 부하 방지
-        time.sleep(0.05)
-        
-    df = pd.DataFrame(all_data)
-    df.to_csv(filename, index=False, encoding='utf-8-sig')
-    logger.success(f"데이터 수집 완료! 총 {len(df)}행 저장됨: {filename}")
+            logger.info(f"새로 추가된 회차가 없습니다. (최신 {last_drw}회)")
+        return df
+
+    existing_last = int(load_history(filename)['drwNo'].max()) if os.path.exists(filename) else 0
+    collected_last = int(max([last_drw] + ([df['drwNo'].max()] if len(df) else []) + [row['drwNo'] for row in pending]))
+    if failed or collected_last < existing_last:
+        flush(partial_path)
+        logger.warning(f"수집이 {collected_last}회에서 멈춰 {filename}(최신 {existing_last}회)은 그대로 둡니다. "
+                       f"진행분은 {partial_path}에 저장, 다음 실행 때 이어받습니다.")
+        return df
+
+    flush(filename)
+    if os.path.exists(partial_path):
+        os.remove(partial_path)
+    logger.success(f"데이터 수집 완료! {fetched}회차 추가, 총 {len(df)}행 저장됨: {filename}")
     return df
 
 if __name__ == "__main__":
-    fetch_all_history()
+    import sys
+    # 기본은 증분 수집. 전체 재수집은: python analysis.py --full
+    fetch_all_history(incremental="--full" not in sys.argv)
@@ -0,0 +1,189 @@
+import time
+import numpy as np
+from loguru import logger
+from draw_matrix import HISTORY_FILE, load_draw_matrix
+from freq_index import FrequencyIndex
+import prize
+
+# 기본 비교 대상 — config.json의 게임 설정과 같은 형식 (mode + analysis_range)
+DEFAULT_STRATEGIES = [
+    {"mode": "max_first", "analysis_range": 10},
+    {"mode": "max_first", "analysis_range": 50},
+    {"mode": "max_first", "analysis_range": 100},
+    {"mode": "max_first", "analysis_range": "all"},
+    {"mode": "random"},
+    {"mode": "ai"},
+]
+
+AI_WINDOW_SIZE = 10  # train_model.py의 window_size와 동일
+
+def strategy_label(game):
+    mode = game.get("mode")
+    if mode == "max_first":
+        return f"max_first({game.get('analysis_range', 50)})"
+    return mode
+
+def _window_of(game):
+    value = game.get("analysis_range", 50)
+    return int(value) if str(value).isdigit() else None
+
+def last_seen_table(matrix):
+    """
+    (N+1, 45) 배열: row t = 위치 t 이전(0..t-1)에서 번호별 마지막 출현 위치 (없으면 -1).
+    누적 최대값 한 번으로 모든 위치를 계산한다.
+    """
+    n = len(matrix)
+    seen = np.full((n + 1, 45), -1, dtype=np.int32)
+    if n:
+        hits = np.full((n, 45), -1, dtype=np.int32)
+        hits[np.arange(n)[:, None], matrix.main.astype(np.intp) - 1] = np.arange(n, dtype=np.int32)[:, None]
+        seen[1:] = np.maximum.accumulate(hits, axis=0)
+    return seen
+
+def _max_first_tickets(matrix, index, positions, game, rng):
+    """
+    각 위치 t에서 [t-window, t) 구간의 빈도 상위 6개.
+    누적 인덱스 덕분에 모든 회차의 구간 빈도를 한 번의 행렬 뺄셈으로 구한다.
+
+    game['tie_break']로 동률 처리 방식을 고른다:
+        'low' (기본, 작은 번호 우선) / 'high' (큰 번호 우선) /
+        'recent' (가장 최근에 나온 번호 우선) / 'random'
+    """
+    window = _window_of(game)
+    ends = positions
+    starts = np.zeros_like(ends) if window is None else np.maximum(0, ends - window)
+    counts = index.prefix[ends] - index.prefix[starts]  # (K, 45)
+
+    tie_break = game.get("tie_break", "low")
+    if tie_break == "high":
+        top = 44 - np.argsort(-counts[:, ::-1], axis=1, kind='stable')[:, :6]
+    elif tie_break == "recent":
+        recency = last_seen_table(matrix)[ends]
+        # 빈도 내림차순, 같은 빈도면 최근 출현 위치 내림차순 (recency는 -1 ~ N-1 범위)
+        key = counts.astype(np.int64) * (len(matrix) + 1) + recency
+        top = np.argsort(-key, axis=1, kind='stable')[:, :6]
+    elif tie_break == "random":
+        top = np.argsort(-(counts + rng.random(counts.shape) * 0.5), axis=1)[:, :6]
+    else:
+        top = np.argsort(-counts, axis=1, kind='stable')[:, :6]
+    return np.sort(top, axis=1) + 1
+
+def _random_tickets(matrix, index, positions, game, rng):
+    keys = rng.random((len(positions), 45))
+    top = np.argpartition(keys, 6, axis=1)[:, :6]
+    return np.sort(top, axis=1) + 1
+
+def _ai_tickets(matrix, index, positions, game, rng):
+    """
+    LSTM 모델로 각 위치의 직전 10회차를 한 번에 배치 예측합니다.
+    run_backtest는 모델이 학습하지 않은 회차만 넘긴다. (_ai_positions)
+    """
+    from model_cache import model_cache, predict_ai
+    if not model_cache.exists():
+        raise FileNotFoundError("lotto_model.h5 없음 (train_model.py로 학습 필요)")
+
+    one_hot = np.zeros((len(matrix), 45), dtype=np.float32)
+    one_hot[np.arange(len(matrix))[:, None], matrix.main.astype(np.intp) - 1] = 1
+    windows = np.stack([one_hot[t - AI_WINDOW_SIZE:t] for t in positions])
+    prediction = np.concatenate([predict_ai(windows[i:i + 256]) for i in range(0, len(windows), 256)])
+    top = np.argsort(prediction, axis=1)[:, -6:]
+    return np.sort(top, axis=1) + 1
+
+def _ai_positions(matrix, positions):
+    """
+    서비스 중인 모델이 학습하지 않은 회차(모델 메타데이터의 trained_through 이후)만 남긴 위치와 리포트 라벨.
+    학습에 쓰인 회차로 채점하면 '이전 데이터만 사용'이 깨지므로, 학습 범위를 모르면 채점하지 않는다.
+    """
+    import model_registry
+    meta = model_registry.current_meta()
+    through = meta.get("trained_through")
+    if not through:
+        raise ValueError("모델 학습 범위(trained_through)를 알 수 없음 "
+                         "(python model_registry.py bootstrap <학습 마지막 회차>로 등록 필요)")
+    kept = positions[matrix.drw_nos[positions] > int(through)]
+    if len(kept) == 0:
+        raise ValueError(f"모델 {model_registry.version_label(meta['version'])}이 학습하지 않은 회차 없음 (~{through}회 학습)")
+    label = (f"ai({model_registry.version_label(meta['version'])}, "
+             f"{int(matrix.drw_nos[kept[0]])}~{int(matrix.drw_nos[kept[-1]])})")
+    return kept, label
+
+TICKET_BUILDERS = {
+    "max_first": _max_first_tickets,
+    "random": _random_tickets,
+    "auto": _random_tickets,  # 사이트 자동선택 = 균등 랜덤
+    "ai": _ai_tickets,
+}
+
+def replay(matrix, index, positions, game, rng):
+    """한 전략으로 positions 각 회차에 1게임씩 구매했을 때의 등수 배열 (K,)."""
+    tickets = TICKET_BUILDERS[game.get("mode")](matrix, index, positions, game, rng)
+    return prize.evaluate_aligned(tickets, matrix.masks[positions], matrix.bonus[positions])
+
+def run_backtest(strategies=None, csv_path=HISTORY_FILE, start=AI_WINDOW_SIZE, end=None, seed=0):
+    """
+    전략별로 회차마다 '그 이전 회차만' 사용해 1게임을 만들고, 해당 회차 결과로 채점합니다.
+
+    Args:
+        strategies (list): 게임 설정 형식의 전략 리스트 (기본 DEFAULT_STRATEGIES)
+        start (int): 첫 채점 회차의 위치 (이전 이력이 최소 start회 있어야 함)
+        end (int): 마지막 채점 위치 + 1 (기본 전체)
+        seed (int): 랜덤 전략용 시드
+
+    Returns:
+        list[dict]: 전략별 결과 (등수 분포, 적중률, 총 구매액/당첨금, ROI)
+    """
+    matrix = load_draw_matrix(csv_path)
+    index = FrequencyIndex.from_matrix(matrix)
+    end = len(matrix) if end is None else min(end, len(matrix))
+    positions = np.arange(max(1, start), end)
+    rng = np.random.default_rng(seed)
+
+    results = []
+    for game in strategies or DEFAULT_STRATEGIES:
+        label = strategy_label(game)
+        if game.get("mode") not in TICKET_BUILDERS:
+            logger.warning(f"백테스트 미지원 모드: {label}")
+            continue
+        t0 = time.perf_counter()
+        try:
+            game_positions = positions
+            if game.get("mode") == "ai":
+                game_positions, label = _ai_positions(matrix, positions)
+            tiers = replay(matrix, index, game_positions, game, rng)
+        except Exception as e:
+            logger.warning(f"{label} 백테스트 건너뜀: {e}")
+            continue
+        results.append(summarize(label, tiers))
+        logger.debug(f"{label}: {len(game_positions)}회차 재생 {time.perf_counter() - t0:.3f}s")
+    return results
+
+def summarize(label, tiers):
+    """등수 배열을 리포트 한 줄(dict)로 요약합니다."""
+    counts = prize.tier_counts(tiers)
+    games = int(tiers.size)
+    cost = games * prize.TICKET_PRICE
+    winnings = int(prize.prize_amounts(tiers).sum())
+    return {
+        "strategy": label,
+        "games": games,
+        "tiers": {str(t): int(counts[t]) for t in range(1, 6)},
+        "hit_rate": float((tiers > 0).mean()) if games else 0.0,
+        "cost": cost,
+        "winnings": winnings,
+        "roi": (winnings - cost) / cost if cost else 0.0,
+    }
+
+def print_report(results):
+    header = f"{'전략':<18}{'게임':>6}{'1등':>5}{'2등':>5}{'3등':>5}{'4등':>6}{'5등':>6}{'적중률':>9}{'ROI':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        t = r["tiers"]
+        print(f"{r['strategy']:<18}{r['games']:>6}{t['1']:>5}{t['2']:>5}{t['3']:>5}{t['4']:>6}{t['5']:>6}"
+              f"{r['hit_rate']:>9.2%}{r['roi']:>9.1%}")
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    report = run_backtest()
+    print_report(report)
+    logger.info(f"백테스트 완료: {time.perf_counter() - started:.2f}s")
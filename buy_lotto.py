@@ -3,6 +3,7 @@ from loguru import logger
 import time
 import os
 import strategies
+import ticket_plan
 from notification import send_discord_message
 
 def buy_games(page: Page, games_config: list, dry_run: bool = False):
@@ -132,28 +133,27 @@ def buy_games(page: Page, games_config: list, dry_run: bool = False):
             send_discord_message("ℹ️ 활성화된 게임이 없어 구매를 건너뜁니다.")
             return
 
-        # 4. 게임 슬롯 순회하며 번호 선택
-        for game in active_games:
+        # 4. 미리 만들어 둔 이번 회차 구매 계획 재생 (로그인 세션 안에서는 분석/모델 로드 없음)
+        #    계획이 없거나 설정이 바뀐 경우에만 즉석 생성 (같은 분석은 한 번만, 게임 간 번호 중복 없음)
+        tickets = ticket_plan.planned_tickets(active_games)
+        if tickets is None:
+            logger.warning("구매 계획 없음 → 번호를 즉석 생성합니다.")
+            tickets = strategies.generate_batch(active_games)
+        else:
+            logger.info(f"{ticket_plan.target_drw_no()}회 구매 계획 사용 ({len(tickets)}게임)")
+
+        # 5. 게임 슬롯 순회하며 번호 선택
+        for game, ticket in zip(active_games, tickets):
             game_id = game.get('id')
             mode = game.get('mode')
-            manual_numbers_str = game.get('numbers', '')
-            analysis_range = game.get('analysis_range', 50)
-            
-            logger.info(f"Game {game_id} 처리 중 (모드: {mode})...")
-            
-            # 수동 번호 파싱
-            manual_numbers = []
-            if manual_numbers_str:
-                try:
-                    manual_numbers = [int(n.strip()) for n in manual_numbers_str.split(',') if n.strip()]
-                except ValueError:
-                    logger.warning(f"Game {game_id}: 번호 형식이 잘못되었습니다. ({manual_numbers_str})")
+            numbers = ticket['numbers']
+            # AI 예측 티켓은 어떤 모델 버전으로 만들었는지 함께 기록
+            mode_label = f"{mode}, 모델 {ticket['model']}" if ticket.get('model') else mode
             
-            # 번호 생성 (strategies.py 사용)
-            numbers = strategies.generate_numbers(mode, manual_numbers, analysis_range)
+            logger.info(f"Game {game_id} 처리 중 (모드: {mode_label})...")
             
             # 결과 기록
-            purchased_details.append(f"Game {game_id} ({mode}): {numbers if numbers else 'Auto'}")
+            purchased_details.append(f"Game {game_id} ({mode_label}): {numbers if numbers else 'Auto'}")
 
             # 번호 마킹
             if numbers is None:
@@ -202,7 +202,7 @@ def buy_games(page: Page, games_config: list, dry_run: bool = False):
                 
             time.sleep(0.5) # 안정성을 위한 대기
             
-        # 5. 구매하기 버튼 클릭
+        # 6. 구매하기 버튼 클릭
         logger.info("모든 게임 선택 완료. 구매 버튼 클릭 대기...")
         
         if dry_run:
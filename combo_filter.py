@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+import numpy as np
+from loguru import logger
+import ticket_codec
+from draw_matrix import BASE_DIR, CACHE_DIR_NAME, load_draw_matrix, HISTORY_FILE
+
+# 6/45 전체 8,145,060개 조합의 특성 컬럼 (조합 순위 순서). 각 컬럼은 uint8 memmap(.npy).
+COMBO_DIR = os.path.join(BASE_DIR, CACHE_DIR_NAME, 'combos')
+FEATURES = ("sum", "odd", "max_run", "decades")
+FEATURE_VERSION = 1
+CHUNK = 1_000_000
+
+META_PATH = os.path.join(COMBO_DIR, "meta.json")
+
+def _path(name):
+    return os.path.join(COMBO_DIR, f"{name}.npy")
+
+def _compute_features(numbers):
+    """(T, 6) 오름차순 번호 → 특성별 (T,) uint8 배열."""
+    nums = numbers.astype(np.int16)
+    features = {
+        "sum": nums.sum(axis=1).astype(np.uint8),        # 최대 40+...+45 = 255
+        "odd": (nums & 1).sum(axis=1).astype(np.uint8),
+    }
+    # 최장 연속 번호 길이 (예: 4,5,6 → 3)
+    consecutive = np.diff(nums, axis=1) == 1
+    run = np.ones(len(nums), dtype=np.uint8)
+    longest = run.copy()
+    for j in range(consecutive.shape[1]):
+        run = np.where(consecutive[:, j], run + 1, 1).astype(np.uint8)
+        np.maximum(longest, run, out=longest)
+    features["max_run"] = longest
+    # 번호대(1-10, 11-20, 21-30, 31-40, 41-45) 중 몇 개 구간에 걸쳐 있는지
+    bands = np.bitwise_or.reduce(np.left_shift(1, (nums - 1) // 10), axis=1)
+    features["decades"] = np.array([bin(i).count("1") for i in range(32)], dtype=np.uint8)[bands]
+    return features
+
+def build_features():
+    """전체 조합을 순위 순서로 복원하여 특성 컬럼 파일을 만듭니다. (최초 1회, 수 초 소요)"""
+    os.makedirs(COMBO_DIR, exist_ok=True)
+    total = ticket_codec.TOTAL_COMBINATIONS
+    tmp_paths = {name: _path(name) + ".tmp" for name in FEATURES}
+    columns = {name: np.lib.format.open_memmap(tmp_paths[name], mode='w+', dtype=np.uint8, shape=(total,))
+               for name in FEATURES}
+    for start in range(0, total, CHUNK):
+        end = min(start + CHUNK, total)
+        chunk = _compute_features(ticket_codec.unrank(np.arange(start, end)))
+        for name in FEATURES:
+            columns[name][start:end] = chunk[name]
+    for name in FEATURES:
+        columns[name].flush()
+        del columns[name]
+        os.replace(tmp_paths[name], _path(name))
+    with open(META_PATH, 'w', encoding='utf-8') as f:
+        json.dump({"version": FEATURE_VERSION, "total": total}, f)
+    logger.info(f"조합 특성 컬럼 생성 완료: {total:,}개 → {COMBO_DIR}")
+
+def _features_ready():
+    try:
+        with open(META_PATH, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        return meta.get("version") == FEATURE_VERSION and all(os.path.exists(_path(n)) for n in FEATURES)
+    except (OSError, ValueError):
+        return False
+
+class ComboFilter:
+    """
+    조합 특성 컬럼에 대한 벡터화된 조건 필터와 균등 추출.
+
+    필터 형식 (config.json 게임의 'filters' 항목):
+        {"sum": [100, 175], "odd": [2, 4], "max_run": 2, "min_decades": 3, "exclude_drawn": true}
+    """
+    def __init__(self, csv_path=HISTORY_FILE):
+        self.csv_path = csv_path
+        self._lock = threading.Lock()
+        self._columns = None
+        self._drawn = None
+        self._drawn_key = None
+        self._selection_cache = {}
+
+    def columns(self):
+        with self._lock:
+            if self._columns is None:
+                if not _features_ready():
+                    build_features()
+                self._columns = {name: np.load(_path(name), mmap_mode='r') for name in FEATURES}
+            return self._columns
+
+    def ever_drawn(self):
+        """조합 순위별 '1등 조합으로 나온 적 있음' 여부 (bool, 8,145,060). 새 회차가 들어오면 갱신."""
+        matrix = load_draw_matrix(self.csv_path)
+        key = (len(matrix), matrix.latest_drw_no)
+        with self._lock:
+            if self._drawn_key != key:
+                drawn = np.zeros(ticket_codec.TOTAL_COMBINATIONS, dtype=bool)
+                if len(matrix):
+                    drawn[ticket_codec.rank(matrix.main)] = True
+                self._drawn = drawn
+                self._drawn_key = key
+                self._selection_cache.clear()
+            return self._drawn
+
+    def query(self, filters):
+        """조건을 모두 만족하는 조합의 불리언 마스크 (8,145,060)."""
+        cols = self.columns()
+        mask = np.ones(ticket_codec.TOTAL_COMBINATIONS, dtype=bool)
+        for name in ("sum", "odd"):
+            if name in filters:
+                low, high = filters[name]
+                mask &= (cols[name] >= low) & (cols[name] <= high)
+        if "max_run" in filters:
+            mask &= cols["max_run"] <= int(filters["max_run"])
+        if "min_decades" in filters:
+            mask &= cols["decades"] >= int(filters["min_decades"])
+        if filters.get("exclude_drawn"):
+            mask &= ~self.ever_drawn()
+        return mask
+
+    def selection(self, filters):
+        """조건을 만족하는 조합 순위 배열 (같은 조건은 캐시 재사용)."""
+        if filters.get("exclude_drawn"):
+            self.ever_drawn()  # 새 회차 반영 시 캐시 무효화
+        key = json.dumps(filters, sort_keys=True)
+        cached = self._selection_cache.get(key)
+        if cached is None:
+            cached = np.flatnonzero(self.query(filters)).astype(np.int32)
+            self._selection_cache[key] = cached
+            logger.info(f"조합 필터 {key}: {len(cached):,}개 조합 ({len(cached) / ticket_codec.TOTAL_COMBINATIONS:.1%})")
+        return cached
+
+    def sample(self, filters, count=1, rng=None, exclude=None):
+        """
+        조건을 만족하는 조합 중 균등하게 count장 (중복 없음) 을 (count, 6) 배열로 뽑습니다.
+        exclude(조합 순위 모음)에 든 조합은 후보에서 빼고 뽑는다. (배치 내 중복 방지용)
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        ranks = self.selection(filters)
+        if exclude:
+            ranks = ranks[~np.isin(ranks, np.fromiter(exclude, dtype=np.int64, count=len(exclude)))]
+        if len(ranks) == 0:
+            raise ValueError(f"조건을 만족하는 조합이 없습니다: {filters}")
+        picked = rng.choice(ranks, size=min(count, len(ranks)), replace=False)
+        return ticket_codec.unrank(picked)
+
+combo_filter = ComboFilter()
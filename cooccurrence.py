@@ -0,0 +1,168 @@
+from itertools import combinations
+import numpy as np
+
+# 한 회차(6개 번호)에서 나오는 쌍 15개 / 삼중쌍 20개의 위치 인덱스
+_PAIR_IDX = np.array(list(combinations(range(6), 2)), dtype=np.intp)
+_TRIPLE_IDX = np.array(list(combinations(range(6), 3)), dtype=np.intp)
+
+def triple_key(a, b, c):
+    """번호 세 개(1~45) → 삼중쌍 키 (오름차순 정렬 후 46진수 정수)."""
+    a, b, c = sorted((int(a), int(b), int(c)))
+    return (a * 46 + b) * 46 + c
+
+def decode_triple(key):
+    key = int(key)
+    return key // 2116, key // 46 % 46, key % 46
+
+class CooccurrenceIndex:
+    """
+    번호 쌍/삼중쌍 동시 출현 인덱스.
+
+    pair_prefix[i] = 앞에서부터 i개 회차 동안의 45×45 동시 출현 횟수 (대각선은 단일 번호 출현 횟수).
+    임의 구간 [start, end)의 쌍 빈도는 pair_prefix[end] - pair_prefix[start] 로 구한다.
+    삼중쌍은 45³ 중 실제로 나온 것만 dict(키 → 횟수)로 들고, 회차별 삼중쌍 키(20개)를 따로 보관해
+    구간 질의에 사용한다.
+
+    새 회차 하나를 추가하는 비용은 이력 길이와 무관하다 (직전 스냅샷 복사 + 쌍 30칸 + 삼중쌍 20개).
+    스냅샷 버퍼는 두 배씩 늘리므로 재할당은 가끔만 일어난다.
+    """
+    def __init__(self, capacity=64):
+        self._pairs = np.zeros((capacity + 1, 45, 45), dtype=np.int32)
+        self._triple_keys = np.zeros((capacity, len(_TRIPLE_IDX)), dtype=np.int32)
+        self._drw_nos = np.zeros(capacity, dtype=np.int32)
+        self._n = 0
+        self.triples = {}
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def drw_nos(self):
+        return self._drw_nos[:self._n]
+
+    @property
+    def pair_prefix(self):
+        return self._pairs[:self._n + 1]
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        index = cls(capacity=max(64, len(matrix)))
+        index.extend(matrix.main, matrix.drw_nos)
+        return index
+
+    def _reserve(self, size):
+        capacity = len(self._drw_nos)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        pairs = np.zeros((capacity + 1, 45, 45), dtype=np.int32)
+        pairs[:self._n + 1] = self.pair_prefix
+        triple_keys = np.zeros((capacity, len(_TRIPLE_IDX)), dtype=np.int32)
+        triple_keys[:self._n] = self._triple_keys[:self._n]
+        drw_nos = np.zeros(capacity, dtype=np.int32)
+        drw_nos[:self._n] = self.drw_nos
+        self._pairs, self._triple_keys, self._drw_nos = pairs, triple_keys, drw_nos
+
+    def extend(self, numbers, drw_nos):
+        """(M, 6) 당첨번호와 회차 번호를 인덱스 끝에 추가합니다."""
+        numbers = np.sort(np.asarray(numbers, dtype=np.intp), axis=1)
+        m = len(numbers)
+        if m == 0:
+            return
+        n = self._n
+        self._reserve(n + m)
+
+        # 회차별 45×45 출현 행렬 (one-hot 외적) 을 누적합으로 이어 붙인다
+        one_hot = np.zeros((m, 45), dtype=np.int32)
+        one_hot[np.arange(m)[:, None], numbers - 1] = 1
+        hits = one_hot[:, :, None] * one_hot[:, None, :]
+        np.cumsum(hits, axis=0, out=self._pairs[n + 1:n + m + 1])
+        self._pairs[n + 1:n + m + 1] += self._pairs[n]
+
+        picked = numbers[:, _TRIPLE_IDX]  # (M, 20, 3)
+        keys = ((picked[..., 0] * 46 + picked[..., 1]) * 46 + picked[..., 2]).astype(np.int32)
+        self._triple_keys[n:n + m] = keys
+        for key in keys.ravel().tolist():
+            self.triples[key] = self.triples.get(key, 0) + 1
+
+        self._drw_nos[n:n + m] = np.asarray(drw_nos, dtype=np.int32)
+        self._n = n + m
+
+    def catch_up(self, matrix):
+        """
+        DrawMatrix에 새로 추가된 회차만 이어 붙입니다.
+        기존 구간이 matrix와 어긋나면(이력 재수집 등) 처음부터 다시 만듭니다.
+        """
+        n = len(self)
+        if n > len(matrix) or (n and matrix.drw_nos[n - 1] != self.drw_nos[-1]):
+            return CooccurrenceIndex.from_matrix(matrix)
+        if len(matrix) > n:
+            self.extend(matrix.main[n:], matrix.drw_nos[n:])
+        return self
+
+    def _start_of(self, window):
+        return 0 if window is None else max(0, self._n - int(window))
+
+    def pair_counts(self, window=None):
+        """최근 window개 회차의 45×45 동시 출현 횟수. [i, j]는 번호 i+1, j+1."""
+        return self._pairs[self._n] - self._pairs[self._start_of(window)]
+
+    def triple_counts(self, window=None):
+        """최근 window개 회차의 삼중쌍 횟수 {triple_key: 횟수}. window가 None이면 누적 dict 그대로 (읽기 전용)."""
+        if window is None:
+            return self.triples
+        keys, counts = np.unique(self._triple_keys[self._start_of(window):self._n], return_counts=True)
+        return dict(zip(keys.tolist(), counts.tolist()))
+
+    def pair_ranking(self, window=None, triple_depth=6):
+        """
+        서로 함께 많이 나온 번호를 차례로 고르는 탐욕 순위 (45개 전체).
+
+        1) 가장 많이 함께 나온 쌍으로 시작
+        2) 이미 고른 번호들과의 쌍 횟수 합이 가장 큰 번호를 추가
+           (앞쪽 triple_depth개를 고르는 동안은 고른 쌍과 함께 나온 삼중쌍 횟수도 더함)
+        동점이면 단일 출현 횟수가 많은 번호, 그다음 작은 번호 우선.
+        """
+        pairs = self.pair_counts(window)
+        triples = self.triple_counts(window)
+        freq = np.diag(pairs).copy()
+        off = pairs - np.diag(freq)
+
+        first = int(np.argmax(np.triu(off, 1)))
+        chosen = [first // 45, first % 45]
+        score = off[chosen].sum(axis=0).astype(np.int64)
+        remaining = np.ones(45, dtype=bool)
+        remaining[chosen] = False
+
+        while remaining.any():
+            total = score.copy()
+            if len(chosen) < triple_depth:
+                for a, b in combinations(chosen, 2):
+                    for k in np.flatnonzero(remaining):
+                        total[k] += triples.get(triple_key(a + 1, b + 1, k + 1), 0)
+            candidates = np.flatnonzero(remaining)
+            order = np.lexsort((candidates, -freq[candidates], -total[candidates]))
+            pick = int(candidates[order[0]])
+            chosen.append(pick)
+            remaining[pick] = False
+            score += off[pick]
+        return [i + 1 for i in chosen]
+
+    def anti_pair_numbers(self, window=None, rng=None, count=6):
+        """
+        서로 함께 나온 적이 적은 번호 조합: 무작위 시작 번호에서 출발해
+        이미 고른 번호들과의 쌍 횟수 합이 가장 작은 번호를 차례로 추가 (동점은 무작위).
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        off = self.pair_counts(window).astype(np.float64)
+        np.fill_diagonal(off, 0)
+        chosen = [int(rng.integers(45))]
+        score = off[chosen[0]].copy()
+        while len(chosen) < count:
+            total = score + rng.random(45) * 0.5
+            total[chosen] = np.inf
+            pick = int(np.argmin(total))
+            chosen.append(pick)
+            score += off[pick]
+        return sorted(i + 1 for i in chosen)
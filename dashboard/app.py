@@ -274,6 +274,45 @@ def get_status():
         "latest_result": latest_result
     })
 
+@app.route('/api/analytics', methods=['GET'])
+def get_analytics():
+    # 봇의 동기화 작업이 미리 계산해 둔 통계 캐시(data_cache/stats.json)를 그대로 반환
+    try:
+        from stats_engine import stats_engine
+        return jsonify({"status": "success", "stats": stats_engine.get()})
+    except Exception as e:
+        return jsonify({"status": "error", "message": f"통계 조회 실패: {str(e)}"})
+
+@app.route('/api/plan', methods=['GET'])
+def get_plan():
+    # 봇이 미리 만들어 둔 이번 회차 구매 계획 (ticket_plan.json)
+    try:
+        import ticket_plan
+        drw_no = ticket_plan.target_drw_no()
+        plan = ticket_plan.get_plan(drw_no)
+        if plan is None:
+            return jsonify({"status": "empty", "drw_no": drw_no, "message": f"{drw_no}회 구매 계획이 아직 없습니다."})
+        return jsonify({"status": "success", "plan": plan, "model": _current_model_summary()})
+    except Exception as e:
+        return jsonify({"status": "error", "message": f"구매 계획 조회 실패: {str(e)}"})
+
+def _current_model_summary():
+    # 서비스 중인 AI 모델 버전 (models/current.json), 보관소가 없으면 None
+    try:
+        import model_registry
+        meta = model_registry.current_meta()
+        if not meta:
+            return None
+        evaluation = meta.get("evaluation") or {}
+        return {
+            "version": model_registry.version_label(meta["version"]),
+            "trained_through": meta.get("trained_through"),
+            "data_through": meta.get("data_through"),
+            "log_loss": evaluation.get("log_loss"),
+        }
+    except Exception:
+        return None
+
 @app.route('/api/images/<filename>')
 def serve_image(filename):
     # 루트 디렉토리의 이미지 파일 서빙
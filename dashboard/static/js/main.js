@@ -1,6 +1,8 @@
 document.addEventListener('DOMContentLoaded', function () {
     loadConfig();
     updateStatus();
+    loadAnalytics();
+    loadPlan();
 
     // 5초마다 상태 갱신
     setInterval(updateStatus, 5000);
@@ -122,6 +124,12 @@ document.addEventListener('DOMContentLoaded', function () {
     });
 });
 
+// 분석 범위(analysis_range)를 쓰는 모드
+const ANALYSIS_MODES = ['max_first', 'pair', 'anti_pair', 'wheel', 'ensemble'];
+
+// 마지막으로 불러온 config.json — 폼에 없는 항목(filters, ensemble, wheel_source 등)을 저장 시 보존
+let loadedConfig = {};
+
 function renderGameSlots(games) {
     const container = document.getElementById('games-container');
     container.innerHTML = '';
@@ -147,9 +155,17 @@ function renderGameSlots(games) {
                     <option value="manual" ${game.mode === 'manual' ? 'selected' : ''}>수동 (Manual)</option>
                     <option value="ai" ${game.mode === 'ai' ? 'selected' : ''}>AI 추천 (Deep Learning)</option>
                     <option value="max_first" ${game.mode === 'max_first' ? 'selected' : ''}>1등 최다 번호 (Max 1st)</option>
+                    <option value="filtered" ${game.mode === 'filtered' ? 'selected' : ''}>조건 필터 (Filtered)</option>
+                    <option value="pair" ${game.mode === 'pair' ? 'selected' : ''}>동반 출현 (Pair)</option>
+                    <option value="anti_pair" ${game.mode === 'anti_pair' ? 'selected' : ''}>비동반 (Anti-Pair)</option>
+                    <option value="cold" ${game.mode === 'cold' ? 'selected' : ''}>장기 미출현 (Cold)</option>
+                    <option value="overdue" ${game.mode === 'overdue' ? 'selected' : ''}>평균 간격 초과 (Overdue)</option>
+                    <option value="markov" ${game.mode === 'markov' ? 'selected' : ''}>전이 확률 (Markov)</option>
+                    <option value="wheel" ${game.mode === 'wheel' ? 'selected' : ''}>휠 분산 (Wheel)</option>
+                    <option value="ensemble" ${game.mode === 'ensemble' ? 'selected' : ''}>가중 앙상블 (Ensemble)</option>
                 </select>
             </div>
-            <div class="analysis-input" id="game_analysis_div_${index}" style="display: ${game.mode === 'max_first' ? 'block' : 'none'};">
+            <div class="analysis-input" id="game_analysis_div_${index}" style="display: ${ANALYSIS_MODES.includes(game.mode) ? 'block' : 'none'};">
                 <label>분석 범위 (최근 회차)</label>
                 <select id="game_analysis_${index}" ${!isActive ? 'disabled' : ''}>
                     <option value="10" ${game.analysis_range == 10 ? 'selected' : ''}>최근 10회</option>
@@ -180,7 +196,7 @@ function renderGameSlots(games) {
 
 function getSlotClass(mode) {
     if (['manual', 'semi_auto'].includes(mode)) return 'manual';
-    if (mode === 'max_first') return 'analysis';
+    if (ANALYSIS_MODES.includes(mode)) return 'analysis';
     return '';
 }
 
@@ -197,7 +213,7 @@ function toggleInputs(selectElem, index) {
     }
 
     // Toggle Analysis Input
-    if (mode === 'max_first') {
+    if (ANALYSIS_MODES.includes(mode)) {
         analysisDiv.style.display = 'block';
     } else {
         analysisDiv.style.display = 'none';
@@ -268,6 +284,8 @@ function loadConfig() {
 }
 
 function populateDashboard(config) {
+    loadedConfig = config;
+
     // Account
     if (config.account) {
         document.getElementById('user_id').value = config.account.user_id || '';
@@ -349,7 +367,10 @@ function saveConfig(source) {
         const activeElem = document.getElementById(`game_active_${i}`);
 
         if (modeElem) {
+            // 폼에서 편집하는 항목만 덮어쓰고 나머지 게임 설정(filters, ensemble, wheel_source, tie_break 등)은 유지
+            const loadedGame = (loadedConfig.games || [])[i] || {};
             games.push({
+                ...loadedGame,
                 id: i + 1,
                 active: activeElem ? activeElem.checked : true,
                 mode: modeElem.value,
@@ -371,6 +392,8 @@ function saveConfig(source) {
             amount: parseInt(document.getElementById('deposit_amount').value) || 20000
         },
         schedule: {
+            // 폼에 없는 일정(plan_*, finetune_*, sync_time)은 불러온 값 유지
+            ...(loadedConfig.schedule || {}),
             deposit_day: document.getElementById('deposit_day').value,
             deposit_time: document.getElementById('deposit_time').value,
             buy_day: document.getElementById('buy_day').value,
@@ -458,3 +481,53 @@ function updateLogs() {
         })
         .catch(error => console.error('Error updating logs:', error));
 }
+
+function loadAnalytics() {
+    fetch('/api/analytics')
+        .then(response => response.json())
+        .then(data => {
+            const tbody = document.querySelector('#analytics-table tbody');
+            if (!tbody) return;
+            if (data.status !== 'success') {
+                tbody.innerHTML = `<tr><td colspan="5" style="padding:6px;">${data.message || '통계 없음'}</td></tr>`;
+                return;
+            }
+            const stats = data.stats;
+            document.getElementById('analytics-basis').textContent = `${stats.latest_drw_no}회 기준 (${stats.draws}회차)`;
+            tbody.innerHTML = Object.entries(stats.windows).map(([label, w]) => `
+                <tr style="border-top:1px solid #414868;">
+                    <td style="padding:6px;">${label === 'all' ? '전체' : `최근 ${label}회`}</td>
+                    <td style="padding:6px; color:#f7768e;">${w.hot.join(', ')}</td>
+                    <td style="padding:6px; color:#7dcfff;">${w.cold.join(', ')}</td>
+                    <td style="padding:6px;">${w.parity.join(' / ')}</td>
+                    <td style="padding:6px;">${w.sum.mean.toFixed(1)} ± ${w.sum.std.toFixed(1)}</td>
+                </tr>
+            `).join('');
+        })
+        .catch(error => console.error('Error loading analytics:', error));
+}
+
+function loadPlan() {
+    fetch('/api/plan')
+        .then(response => response.json())
+        .then(data => {
+            const list = document.getElementById('plan-list');
+            if (!list) return;
+            if (data.status !== 'success') {
+                list.textContent = data.message || '구매 계획 없음';
+                return;
+            }
+            const plan = data.plan;
+            const model = data.model ? ` · AI 모델 ${data.model.version}` : '';
+            document.getElementById('plan-basis').textContent = `${plan.drw_no}회 · 생성 ${plan.created_at}${model}`;
+            list.innerHTML = plan.tickets.map(t => `
+                <div style="padding:8px 10px; margin-bottom:6px; background:#24283b; border-radius:6px;">
+                    <span style="color:#7aa2f7; font-weight:600;">Game ${t.id}</span>
+                    <span style="color:#565f89;">(${t.mode})</span>
+                    ${t.model ? `<span style="margin-left:6px; color:#bb9af7; font-size:0.85em;">모델 ${t.model}</span>` : ''}
+                    <span style="margin-left:10px; color:#c0caf5;">${t.numbers ? t.numbers.join(', ') : '자동 선택'}</span>
+                </div>
+            `).join('') || '구매할 게임이 없습니다.';
+        })
+        .catch(error => console.error('Error loading plan:', error));
+}
@@ -0,0 +1,180 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from loguru import logger
+
+# 동행복권 회차별 당첨번호 조회 (비공식 공개 API)
+DRAW_API_URL = "https://www.dhlottery.co.kr/common.do?method=getLottoNumber&drwNo={drw_no}"
+
+# 회차별 조회 결과 디스크 캐시. 추첨이 끝난 회차의 결과는 바뀌지 않으므로 영구 보관하고,
+# 아직 발표 전인 회차(returnValue=fail)는 짧은 TTL 동안만 '없음'으로 기억한다.
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data_cache', 'draws')
+NEGATIVE_TTL_SEC = 600
+
+# 대량 수집 시 동시 요청 수 / 초당 요청 상한 (사이트 부하 방지)
+# 평상시에는 과거 회차가 모두 디스크 캐시에 있어 새 회차 한두 건만 요청하므로 상한이 낮아도 된다.
+# 최초 백필(1,200여 회차)은 상한이 곧 소요 시간이 되므로(10건/초면 약 2분) 별도 상한을 쓴다.
+# 둘 다 환경변수로 조정 가능 — 높일수록 빨라지지만 사이트에 429/차단을 당할 위험도 커진다.
+MAX_WORKERS = 8
+MAX_REQUESTS_PER_SEC = float(os.getenv("DRAW_API_MAX_RPS", "10"))
+BACKFILL_REQUESTS_PER_SEC = float(os.getenv("DRAW_API_BACKFILL_RPS", "40"))
+
+class DrawFetchError(Exception):
+    """네트워크/HTTP/응답 형식 오류로 회차를 조회하지 못함 (아직 발표 전인 회차와 구분)."""
+
+class RateLimiter:
+    """여러 스레드가 공유하는 요청 간격 제한기. 호출 순서대로 최소 간격을 두고 슬롯을 배정한다."""
+    def __init__(self, rate_per_sec):
+        self.interval = 1.0 / rate_per_sec
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+_rate_limiter = RateLimiter(MAX_REQUESTS_PER_SEC)
+backfill_rate_limiter = RateLimiter(BACKFILL_REQUESTS_PER_SEC)
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """커넥션 풀을 재사용하는 공용 세션 (동시 요청 수만큼 keep-alive 연결 유지)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            retry = Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS, max_retries=retry)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+_stats = {"hits": 0, "negative_hits": 0, "misses": 0, "stored": 0, "errors": 0}
+_stats_lock = threading.Lock()
+
+def _count(key):
+    with _stats_lock:
+        _stats[key] += 1
+
+def cache_stats():
+    """캐시 적중/미스 카운터 (misses = 실제 사이트 요청 수). 정상 상태에서는 과거 회차 요청이 0이어야 한다."""
+    with _stats_lock:
+        return dict(_stats)
+
+def _cache_path(drw_no, negative=False):
+    return os.path.join(CACHE_DIR, f"{int(drw_no)}.{'miss' if negative else 'json'}")
+
+def _read_cache(drw_no):
+    """캐시 조회. (적중 여부, 값) — 음성 캐시 적중이면 (True, None)."""
+    try:
+        with open(_cache_path(drw_no), 'r', encoding='utf-8') as f:
+            return True, json.load(f)
+    except (OSError, ValueError):
+        pass
+    try:
+        if time.time() - os.path.getmtime(_cache_path(drw_no, negative=True)) < NEGATIVE_TTL_SEC:
+            return True, None
+    except OSError:
+        pass
+    return False, None
+
+def _write_cache(drw_no, data):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _cache_path(drw_no, negative=data is None)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    if data is not None:
+        # 발표된 회차는 음성 캐시 흔적을 정리
+        try:
+            os.remove(_cache_path(drw_no, negative=True))
+        except OSError:
+            pass
+
+def fetch_draw(drw_no, timeout=3, use_cache=True, raise_errors=False, rate_limiter=None):
+    """
+    특정 회차의 당첨 정보를 조회합니다. (디스크 캐시 → 사이트 순)
+
+    Args:
+        raise_errors (bool): True면 조회 실패 시 None 대신 DrawFetchError를 던진다.
+            (이력 수집처럼 '발표 전'과 '실패'를 구분해야 하는 호출부용)
+        rate_limiter (RateLimiter): 사이트 요청에 쓸 속도 제한기. 없으면 공용 제한기.
+
+    Returns:
+        dict: {"drwNo", "date", "num1"~"num6", "bonus"} — lotto_history.csv 행 형식.
+              아직 추첨 전이거나 조회 실패 시 None.
+    """
+    if use_cache:
+        hit, cached = _read_cache(drw_no)
+        if hit:
+            _count("hits" if cached is not None else "negative_hits")
+            return cached
+
+    _count("misses")
+    (rate_limiter or _rate_limiter).wait()
+    try:
+        res = get_session().get(DRAW_API_URL.format(drw_no=drw_no), timeout=timeout)
+        data = res.json()
+    except Exception as e:
+        # 네트워크/응답 오류는 캐시하지 않음 (다음 호출 때 다시 시도)
+        _count("errors")
+        logger.error(f"회차 {drw_no} 조회 실패: {e}")
+        if raise_errors:
+            raise DrawFetchError(f"회차 {drw_no} 조회 실패: {e}") from e
+        return None
+
+    result = None
+    if data.get("returnValue") == "success":
+        result = {
+            "drwNo": data["drwNo"],
+            "date": data["drwNoDate"],
+            "num1": data["drwtNo1"],
+            "num2": data["drwtNo2"],
+            "num3": data["drwtNo3"],
+            "num4": data["drwtNo4"],
+            "num5": data["drwtNo5"],
+            "num6": data["drwtNo6"],
+            "bonus": data["bnusNo"]
+        }
+
+    if use_cache:
+        try:
+            _write_cache(drw_no, result)
+            if result is not None:
+                _count("stored")
+        except OSError as e:
+            logger.warning(f"회차 {drw_no} 캐시 저장 실패(무시): {e}")
+    return result
+
+def fetch_draws(drw_nos, max_workers=MAX_WORKERS, raise_errors=False, rate_limiter=None):
+    """
+    여러 회차를 스레드 풀로 동시에 조회합니다. (공용 세션 + 공용 속도 제한)
+    raise_errors=True면 하나라도 조회에 실패했을 때 DrawFetchError를 던진다.
+    rate_limiter를 주면 공용 제한기 대신 그 상한을 쓴다. (백필용 backfill_rate_limiter 등)
+
+    Returns:
+        list: 입력한 drw_nos와 같은 순서의 결과 리스트 (없는 회차는 None)
+    """
+    drw_nos = list(drw_nos)
+    if not drw_nos:
+        return []
+    fetch = partial(fetch_draw, raise_errors=raise_errors, rate_limiter=rate_limiter)
+    if len(drw_nos) == 1:
+        return [fetch(drw_nos[0])]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(drw_nos))) as executor:
+        # executor.map은 입력 순서대로 결과를 돌려준다
+        return list(executor.map(fetch, drw_nos))
@@ -0,0 +1,144 @@
+import csv
+import json
+import os
+import threading
+import numpy as np
+from loguru import logger
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_FILE = os.path.join(BASE_DIR, 'lotto_history.csv')
+# CSV에서 파생된 바이너리 캐시 보관 폴더 (언제든 지워도 CSV에서 다시 생성됨)
+CACHE_DIR_NAME = 'data_cache'
+
+class DrawMatrix:
+    """
+    당첨번호 이력의 압축 표현. 모든 배열은 drwNo 오름차순의 읽기 전용 memmap이다.
+    (전략/학습/대시보드가 같은 배열을 복사 없이 공유)
+
+    Attributes:
+        drw_nos (int32, N): 회차 번호
+        dates (datetime64[D], N): 추첨일
+        numbers (uint8, N×7): 당첨번호 6개(오름차순) + 보너스
+        masks (uint64, N): 당첨번호 6개의 45비트 마스크 (번호 n → bit n-1, 보너스 제외)
+    """
+    def __init__(self, drw_nos, dates, numbers, masks):
+        self.drw_nos = drw_nos
+        self.dates = dates
+        self.numbers = numbers
+        self.masks = masks
+
+    def __len__(self):
+        return len(self.drw_nos)
+
+    @property
+    def main(self):
+        """보너스를 제외한 당첨번호 (N×6 뷰)."""
+        return self.numbers[:, :6]
+
+    @property
+    def bonus(self):
+        """보너스 번호 (N 뷰)."""
+        return self.numbers[:, 6]
+
+    @property
+    def latest_drw_no(self):
+        return int(self.drw_nos[-1]) if len(self) else 0
+
+    def index_of(self, drw_no):
+        """회차 번호의 행 인덱스. 없으면 None."""
+        i = int(np.searchsorted(self.drw_nos, drw_no))
+        if i < len(self) and self.drw_nos[i] == drw_no:
+            return i
+        return None
+
+def numbers_to_masks(numbers):
+    """(..., k) 번호 배열(1~45)을 번호별 비트를 OR한 uint64 마스크 배열로 변환합니다."""
+    numbers = np.asarray(numbers)
+    bits = np.left_shift(np.uint64(1), (numbers.astype(np.uint64) - np.uint64(1)))
+    return np.bitwise_or.reduce(bits, axis=-1)
+
+def _cache_paths(csv_path):
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR_NAME)
+    prefix = os.path.splitext(os.path.basename(csv_path))[0]
+    names = ("drw_nos", "dates", "numbers", "masks")
+    paths = {name: os.path.join(cache_dir, f"{prefix}.{name}.npy") for name in names}
+    paths["meta"] = os.path.join(cache_dir, f"{prefix}.meta.json")
+    return cache_dir, paths
+
+def _source_stamp(csv_path):
+    st = os.stat(csv_path)
+    return [st.st_mtime_ns, st.st_size]
+
+def _read_csv(csv_path):
+    rows = []
+    # analysis.py가 utf-8-sig(BOM)로 저장하므로 동일 인코딩으로 읽음
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            nums = sorted(int(row[f"num{i}"]) for i in range(1, 7))
+            rows.append((int(row["drwNo"]), row["date"], nums + [int(row["bonus"])]))
+    rows.sort(key=lambda r: r[0])
+    return rows
+
+def build_draw_matrix(csv_path=HISTORY_FILE):
+    """CSV를 파싱하여 바이너리 캐시(.npy)를 만들고 DrawMatrix를 반환합니다."""
+    cache_dir, paths = _cache_paths(csv_path)
+    stamp = _source_stamp(csv_path)
+    rows = _read_csv(csv_path)
+
+    arrays = {
+        "drw_nos": np.array([r[0] for r in rows], dtype=np.int32),
+        "dates": np.array([r[1] for r in rows], dtype='datetime64[D]'),
+        "numbers": np.array([r[2] for r in rows], dtype=np.uint8).reshape(-1, 7),
+    }
+    arrays["masks"] = numbers_to_masks(arrays["numbers"][:, :6])
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # 배열을 모두 교체한 뒤 마지막에 meta를 쓴다 — meta가 원본과 일치할 때만 캐시를 신뢰
+    for name, arr in arrays.items():
+        tmp_path = paths[name] + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, arr)
+        os.replace(tmp_path, paths[name])
+    tmp_meta = paths["meta"] + ".tmp"
+    with open(tmp_meta, 'w', encoding='utf-8') as f:
+        json.dump({"source_stamp": stamp, "count": len(rows),
+                   "latest_drw_no": int(arrays["drw_nos"][-1]) if rows else 0}, f)
+    os.replace(tmp_meta, paths["meta"])
+    logger.info(f"당첨번호 행렬 캐시 생성: {len(rows)}회차 → {cache_dir}")
+    return _open_cache(paths)
+
+def _open_cache(paths):
+    return DrawMatrix(*(np.load(paths[name], mmap_mode='r') for name in ("drw_nos", "dates", "numbers", "masks")))
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+def load_draw_matrix(csv_path=HISTORY_FILE):
+    """
+    CSV에 대응하는 DrawMatrix를 반환합니다.
+    프로세스 내에서는 원본이 바뀌지 않는 한 같은 객체를 재사용하고, 디스크 캐시가 원본과
+    일치하면 파싱 없이 memmap으로 바로 연다. (CSV가 바뀌었을 때만 재생성)
+    """
+    csv_path = os.path.abspath(csv_path)
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"{csv_path} not found. Run analysis.py first.")
+
+    stamp = _source_stamp(csv_path)
+    with _cache_lock:
+        cached = _cache.get(csv_path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        _, paths = _cache_paths(csv_path)
+        matrix = None
+        try:
+            with open(paths["meta"], 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get("source_stamp") == stamp:
+                matrix = _open_cache(paths)
+        except (OSError, ValueError):
+            pass
+        if matrix is None:
+            matrix = build_draw_matrix(csv_path)
+        _cache[csv_path] = (stamp, matrix)
+        return matrix
@@ -0,0 +1,133 @@
+import os
+import threading
+from loguru import logger
+from draw_matrix import HISTORY_FILE, load_draw_matrix
+from freq_index import FrequencyIndex
+from cooccurrence import CooccurrenceIndex
+from gap_index import GapIndex
+from markov import MarkovModel, load_markov
+
+class DrawStore:
+    """
+    로컬 당첨번호 저장소.
+
+    lotto_history.csv를 원본으로 사용하며, 실제 조회는 CSV에서 만든 DrawMatrix(memmap)를
+    통해 이루어진다 (CSV가 바뀌었을 때만 다시 생성).
+    번호 생성(구매 시점)에서는 네트워크를 전혀 쓰지 않고 이 저장소만 조회하고,
+    새 회차는 sync()로 마지막 회차 이후분만 받아서 CSV 뒤에 붙인다.
+    """
+    def __init__(self, file_path=HISTORY_FILE):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._freq_index = None
+        self._cooccurrence = None
+        self._gap_index = None
+        self._markov = None
+
+    def _reload_if_changed(self):
+        if not os.path.exists(self.file_path):
+            self._matrix = None
+            return
+        try:
+            matrix = load_draw_matrix(self.file_path)
+        except Exception as e:
+            logger.error(f"당첨번호 저장소 로드 실패: {e}")
+            return
+        if matrix is not self._matrix:
+            self._matrix = matrix
+            logger.debug(f"당첨번호 저장소 로드: {len(matrix)}회차 (최신 {matrix.latest_drw_no}회)")
+
+    def matrix(self):
+        """현재 이력의 DrawMatrix (이력이 없으면 None)."""
+        with self._lock:
+            self._reload_if_changed()
+            return self._matrix
+
+    def frequency_index(self):
+        """번호별 누적 출현 인덱스. 새 회차가 들어오면 추가분만 이어 붙여 갱신한다."""
+        with self._lock:
+            self._reload_if_changed()
+            if self._matrix is None:
+                return FrequencyIndex()
+            if self._freq_index is None:
+                self._freq_index = FrequencyIndex.from_matrix(self._matrix)
+            else:
+                self._freq_index = self._freq_index.catch_up(self._matrix)
+            return self._freq_index
+
+    def cooccurrence_index(self):
+        """번호 쌍/삼중쌍 동시 출현 인덱스. 새 회차가 들어오면 추가분만 이어 붙여 갱신한다."""
+        with self._lock:
+            self._reload_if_changed()
+            if self._matrix is None:
+                return CooccurrenceIndex()
+            if self._cooccurrence is None:
+                self._cooccurrence = CooccurrenceIndex.from_matrix(self._matrix)
+            else:
+                self._cooccurrence = self._cooccurrence.catch_up(self._matrix)
+            return self._cooccurrence
+
+    def gap_index(self):
+        """번호별 미출현 간격 인덱스. 새 회차가 들어오면 추가분만 반영한다."""
+        with self._lock:
+            self._reload_if_changed()
+            if self._matrix is None:
+                return GapIndex()
+            if self._gap_index is None:
+                self._gap_index = GapIndex.from_matrix(self._matrix)
+            else:
+                self._gap_index = self._gap_index.catch_up(self._matrix)
+            return self._gap_index
+
+    def markov_model(self):
+        """번호 전이 행렬. 처음에는 저장 파일(lotto_markov.npz)에서 불러오고, 새 회차는 추가분만 반영해 다시 저장한다."""
+        with self._lock:
+            self._reload_if_changed()
+            if self._matrix is None:
+                return MarkovModel()
+            if self._markov is None or len(self._markov) != len(self._matrix):
+                self._markov = load_markov(self._matrix, self.file_path)
+            return self._markov
+
+    def latest_drw_no(self):
+        """저장소에 있는 가장 최근 회차 번호 (없으면 0)."""
+        return self._matrix.latest_drw_no if self._matrix is not None else 0
+
+    def get_numbers(self, drw_no):
+        """특정 회차의 당첨 번호 6개를 반환합니다. 저장소에 없으면 None."""
+        m = self.matrix()
+        i = m.index_of(int(drw_no)) if m is not None else None
+        return m.main[i].tolist() if i is not None else None
+
+    def recent_numbers(self, count):
+        """최근 N회차의 당첨 번호를 과거→최신 순서로 반환합니다."""
+        m = self.matrix()
+        if m is None or count <= 0:
+            return []
+        return m.main[-count:].tolist()
+
+    def sync(self):
+        """
+        저장소의 마지막 회차 이후 새로 추첨된 회차만 받아 CSV에 추가합니다.
+        (구매 시점이 아닌 스케줄러 시작/정기 동기화 때 호출)
+
+        Returns:
+            int: 새로 추가된 회차 수
+        """
+        from analysis import fetch_all_history
+
+        with self._lock:
+            self._reload_if_changed()
+            last = self.latest_drw_no()
+
+        fetch_all_history(self.file_path, incremental=True)
+
+        with self._lock:
+            self._reload_if_changed()
+            added = self.latest_drw_no() - last
+        if added > 0:
+            logger.success(f"당첨번호 저장소 동기화: {added}회차 추가 (최신 {self.latest_drw_no()}회)")
+        return max(added, 0)
+
+draw_store = DrawStore()
@@ -0,0 +1,83 @@
+import numpy as np
+import ticket_codec
+
+# config.json 게임의 'ensemble' 항목 기본값. 'noise'는 점수에 더하는 Gumbel 잡음의 크기(온도).
+DEFAULT_WEIGHTS = {"freq": 1.0, "gap": 0.0, "pair": 0.5, "markov": 0.0, "ai": 0.0, "noise": 1.0}
+SIGNALS = ("freq", "gap", "pair", "markov", "ai")
+
+def zscore(values):
+    """(45,) 벡터를 평균 0, 표준편차 1로 맞춥니다. (모두 같은 값이면 0 벡터)"""
+    values = np.asarray(values, dtype=np.float64)
+    std = values.std()
+    return (values - values.mean()) / std if std > 0 else np.zeros_like(values)
+
+def score_vectors(store, window=None, ai_scores=None, signals=SIGNALS):
+    """
+    번호별(1~45) 신호 벡터를 표준화해서 모읍니다. 값이 클수록 선호.
+
+        freq   : 최근 window회차 출현 횟수
+        gap    : 현재 미출현 간격 (오래 안 나온 번호일수록 큼)
+        pair   : 최신 회차 번호들과 최근 window회차 동안 함께 나온 횟수
+        markov : 최신 회차 → 다음 회차 전이 확률
+        ai     : LSTM 예측 확률 (ai_scores를 넘긴 경우에만)
+
+    Args:
+        store: DrawStore (각 인덱스를 증분 갱신된 상태로 제공)
+        signals: 계산할 신호 이름 (가중치가 0인 신호는 건너뛰도록 호출부에서 걸러 넘김)
+    """
+    vectors = {}
+    if "freq" in signals:
+        vectors["freq"] = zscore(store.frequency_index().window_counts(window))
+    if "gap" in signals:
+        vectors["gap"] = zscore(store.gap_index().current_gap())
+    if "pair" in signals:
+        latest = store.recent_numbers(1)
+        if latest:
+            pairs = store.cooccurrence_index().pair_counts(window).astype(np.float64)
+            np.fill_diagonal(pairs, 0)
+            vectors["pair"] = zscore(pairs[np.asarray(latest[0]) - 1].sum(axis=0))
+    if "markov" in signals:
+        vectors["markov"] = zscore(store.markov_model().predict())
+    if "ai" in signals and ai_scores is not None:
+        vectors["ai"] = zscore(ai_scores)
+    return vectors
+
+def combine(vectors, weights):
+    """가중 합 (45,). 없는 신호(모델 없음 등)는 0으로 취급한다."""
+    total = np.zeros(45)
+    for name, vector in vectors.items():
+        total += float(weights.get(name, 0.0)) * vector
+    return total
+
+def sample_tickets(scores, count=1, noise=1.0, rng=None, exclude=None, max_rounds=100):
+    """
+    점수 벡터에서 서로 다른 티켓 count장을 뽑습니다.
+
+    티켓마다 점수 + noise × Gumbel 잡음의 상위 6개를 고른다 (Gumbel-top-k: softmax(점수/noise)
+    분포에서 비복원 추출과 같음). noise=0이면 점수 상위 6개 하나뿐이므로 겹치는 장은
+    잡음을 조금씩 키워 다시 뽑는다.
+
+    Args:
+        scores: (45,) 결합 점수
+        exclude (set[int]): 이미 쓰인 조합 순위
+
+    Returns:
+        list[list[int]]: count장의 오름차순 번호 리스트
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    scores = np.asarray(scores, dtype=np.float64)
+    used = set(exclude or ())
+    tickets = []
+    temperature = float(noise)
+    for _ in range(max_rounds):
+        need = count - len(tickets)
+        if need <= 0:
+            break
+        keys = scores + temperature * rng.gumbel(size=(need, 45))
+        picked = np.sort(np.argpartition(-keys, 6, axis=1)[:, :6], axis=1) + 1
+        for ticket, rank in zip(picked, ticket_codec.rank(picked)):
+            if rank not in used:
+                used.add(int(rank))
+                tickets.append(ticket.tolist())
+        temperature = max(temperature, 0.05) * 1.5
+    return tickets[:count]
@@ -0,0 +1,72 @@
+import numpy as np
+
+class FrequencyIndex:
+    """
+    번호별 누적 출현 횟수 인덱스.
+
+    prefix[i] = 앞에서부터 i개 회차 동안 번호별(1~45) 출현 횟수 → (N+1)×45 배열.
+    임의 구간 [start, end)의 번호별 빈도는 prefix[end] - prefix[start] 한 번의 벡터 뺄셈으로 구한다.
+    새 회차는 extend()로 마지막 누적값 뒤에 이어 붙인다. (전체 재계산 없음)
+    """
+    def __init__(self):
+        self.prefix = np.zeros((1, 45), dtype=np.int32)
+        self.drw_nos = np.zeros(0, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.drw_nos)
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        index = cls()
+        index.extend(matrix.main, matrix.drw_nos)
+        return index
+
+    def extend(self, numbers, drw_nos):
+        """(M, 6) 당첨번호와 회차 번호를 인덱스 끝에 추가합니다."""
+        numbers = np.asarray(numbers)
+        if len(numbers) == 0:
+            return
+        hits = np.zeros((len(numbers), 45), dtype=np.int32)
+        hits[np.arange(len(numbers))[:, None], numbers.astype(np.intp) - 1] = 1
+        new_prefix = np.cumsum(hits, axis=0, dtype=np.int32) + self.prefix[-1]
+        self.prefix = np.concatenate([self.prefix, new_prefix])
+        self.drw_nos = np.concatenate([self.drw_nos, np.asarray(drw_nos, dtype=np.int32)])
+
+    def catch_up(self, matrix):
+        """
+        DrawMatrix에 새로 추가된 회차만 이어 붙입니다.
+        기존 구간이 matrix와 어긋나면(이력 재수집 등) 처음부터 다시 만듭니다.
+
+        Returns:
+            FrequencyIndex: 갱신된 인덱스 (보통 self)
+        """
+        n = len(self)
+        if n > len(matrix) or (n and matrix.drw_nos[n - 1] != self.drw_nos[-1]):
+            return FrequencyIndex.from_matrix(matrix)
+        if len(matrix) > n:
+            self.extend(matrix.main[n:], matrix.drw_nos[n:])
+        return self
+
+    def counts(self, start, end):
+        """회차 위치 구간 [start, end)의 번호별 출현 횟수 (45,). 인덱스 0은 번호 1."""
+        return self.prefix[end] - self.prefix[start]
+
+    def window_counts(self, window=None):
+        """최근 window개 회차의 번호별 출현 횟수 (45,). window가 None이면 전체."""
+        n = len(self)
+        start = 0 if window is None else max(0, n - int(window))
+        return self.counts(start, n)
+
+    def ranking(self, window=None):
+        """최근 window개 회차 기준 45개 번호 전체를 빈도 내림차순으로 (동률이면 작은 번호 우선)."""
+        counts = self.window_counts(window)
+        return [int(i) + 1 for i in np.argsort(-counts, kind='stable')]
+
+    def top_k(self, window=None, k=6):
+        """
+        최근 window개 회차에서 가장 많이 나온 번호 k개 (출현 횟수 내림차순, 동률이면 작은 번호 우선).
+        한 번도 나오지 않은 번호는 제외하므로 k개보다 적을 수 있다.
+        """
+        counts = self.window_counts(window)
+        order = np.argsort(-counts, kind='stable')[:k]
+        return [int(i) + 1 for i in order if counts[i] > 0]
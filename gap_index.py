@@ -0,0 +1,82 @@
+import numpy as np
+
+class GapIndex:
+    """
+    번호별 미출현 간격(gap) 인덱스.
+
+    gap = 두 번 연속 출현 사이에 건너뛴 회차 수 (연속 회차 출현이면 0).
+    번호별로 마지막 출현 위치, 지금까지 닫힌 간격의 개수/합/최댓값만 들고 있으므로
+    현재 간격·평균 간격·최대 간격을 45개 번호에 대해 벡터 한 번으로 읽을 수 있고,
+    새 회차는 extend()로 출현한 6개 번호만 갱신한다. (이력을 거꾸로 훑지 않음)
+    """
+    def __init__(self):
+        self.last_seen = np.full(45, -1, dtype=np.int32)
+        self.gap_count = np.zeros(45, dtype=np.int32)
+        self.gap_sum = np.zeros(45, dtype=np.int64)
+        self.gap_max = np.zeros(45, dtype=np.int32)
+        self.drw_nos = np.zeros(0, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.drw_nos)
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        index = cls()
+        index.extend(matrix.main, matrix.drw_nos)
+        return index
+
+    def extend(self, numbers, drw_nos):
+        """(M, 6) 당첨번호와 회차 번호를 인덱스 끝에 추가합니다."""
+        numbers = np.asarray(numbers, dtype=np.intp)
+        pos = len(self)
+        for row in numbers - 1:
+            seen = self.last_seen[row]
+            closed = seen >= 0
+            gaps = pos - seen[closed] - 1
+            hit = row[closed]
+            self.gap_count[hit] += 1
+            self.gap_sum[hit] += gaps
+            self.gap_max[hit] = np.maximum(self.gap_max[hit], gaps)
+            self.last_seen[row] = pos
+            pos += 1
+        self.drw_nos = np.concatenate([self.drw_nos, np.asarray(drw_nos, dtype=np.int32)])
+
+    def catch_up(self, matrix):
+        """
+        DrawMatrix에 새로 추가된 회차만 반영합니다.
+        기존 구간이 matrix와 어긋나면(이력 재수집 등) 처음부터 다시 만듭니다.
+        """
+        n = len(self)
+        if n > len(matrix) or (n and matrix.drw_nos[n - 1] != self.drw_nos[-1]):
+            return GapIndex.from_matrix(matrix)
+        if len(matrix) > n:
+            self.extend(matrix.main[n:], matrix.drw_nos[n:])
+        return self
+
+    def current_gap(self):
+        """번호별 마지막 출현 이후 지나간 회차 수 (45,). 한 번도 안 나온 번호는 전체 회차 수."""
+        return (len(self) - 1 - self.last_seen).astype(np.int32)
+
+    def mean_gap(self):
+        """번호별 평균 간격 (45,). 닫힌 간격이 없으면 현재 간격으로 대신한다."""
+        current = self.current_gap().astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self.gap_sum / self.gap_count
+        return np.where(self.gap_count > 0, mean, current)
+
+    def max_gap(self):
+        """번호별 최대 간격 (45,). 아직 끝나지 않은 현재 간격도 포함."""
+        return np.maximum(self.gap_max, self.current_gap())
+
+    def stats(self):
+        """{'current', 'mean', 'max'} 번호별 간격 벡터 (인덱스 0은 번호 1)."""
+        return {"current": self.current_gap(), "mean": self.mean_gap(), "max": self.max_gap()}
+
+    def cold_ranking(self):
+        """현재 간격이 긴 순서로 45개 번호 (동률이면 작은 번호 우선)."""
+        return [int(i) + 1 for i in np.argsort(-self.current_gap(), kind='stable')]
+
+    def overdue_ranking(self):
+        """현재 간격 / 평균 간격 비율이 큰 순서로 45개 번호 (평소 주기보다 오래 안 나온 번호 우선)."""
+        ratio = self.current_gap() / np.maximum(self.mean_gap(), 1.0)
+        return [int(i) + 1 for i in np.argsort(-ratio, kind='stable')]
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import numpy as np
+from loguru import logger
+from draw_matrix import BASE_DIR
+
+# TensorFlow 없이 LSTM 모델(lotto_model.h5)을 추론하기 위한 가중치 파일과 순수 NumPy 순전파.
+# 구조: LSTM(128, return_sequences) → Dropout → LSTM(64) → Dropout → Dense(45, sigmoid)
+# Dropout은 추론 시 항등이므로 가중치가 있는 층(LSTM, Dense)만 내보낸다.
+MODEL_PATH = os.path.join(BASE_DIR, "lotto_model.h5")
+WEIGHTS_PATH = os.path.join(BASE_DIR, "lotto_model.npz")
+
+def _sigmoid(x):
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)  # 1/(1+e^-x)와 같고 overflow 경고가 없음
+
+def _hard_sigmoid(x):
+    return np.clip(x / 6.0 + 0.5, 0.0, 1.0)  # Keras 3 정의
+
+ACTIVATIONS = {
+    "sigmoid": _sigmoid,
+    "tanh": np.tanh,
+    "hard_sigmoid": _hard_sigmoid,
+    "relu": lambda x: np.maximum(x, 0.0),
+    "linear": lambda x: x,
+}
+
+def _layer_weights_h5(h5_path):
+    """h5py로 .h5를 직접 읽어 (층 설정, {가중치 이름: 배열}) 리스트를 만듭니다. (TensorFlow 불필요)"""
+    import h5py
+    layers = []
+    with h5py.File(h5_path, "r") as f:
+        config = json.loads(f.attrs["model_config"])
+        group = f["model_weights"]
+        for layer in config["config"]["layers"]:
+            kind, cfg = layer["class_name"], layer["config"]
+            if kind not in ("LSTM", "Dense"):
+                continue
+            weights = {}
+            def collect(name, obj):
+                if hasattr(obj, "shape"):
+                    weights[name.split("/")[-1].split(":")[0]] = np.asarray(obj, dtype=np.float32)
+            group[cfg["name"]].visititems(collect)
+            layers.append((kind, cfg, weights))
+    return layers
+
+def _layer_weights_keras(h5_path):
+    """h5py가 없을 때: Keras로 모델을 열어 같은 형식으로 만듭니다."""
+    from tensorflow.keras.models import load_model
+    layers = []
+    for layer in load_model(h5_path).layers:
+        kind = type(layer).__name__
+        if kind not in ("LSTM", "Dense"):
+            continue
+        names = ("kernel", "recurrent_kernel", "bias") if kind == "LSTM" else ("kernel", "bias")
+        layers.append((kind, layer.get_config(), dict(zip(names, layer.get_weights()))))
+    return layers
+
+def file_digest(path):
+    """원본 모델 파일의 SHA-1 (체크아웃/복사로 mtime이 바뀌어도 같은 모델인지 판별)."""
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def export_weights(h5_path=MODEL_PATH, npz_path=WEIGHTS_PATH):
+    """
+    학습된 모델의 LSTM/Dense 가중치를 .npz로 내보냅니다.
+    원본 .h5의 해시를 함께 저장해, 모델이 다시 학습되면 자동으로 다시 내보낼 수 있게 한다.
+    """
+    try:
+        layers = _layer_weights_h5(h5_path)
+    except ImportError:
+        layers = _layer_weights_keras(h5_path)
+
+    arrays = {
+        "layers": np.array([kind.lower() for kind, _, _ in layers]),
+        "source_sha1": np.array(file_digest(h5_path)),
+    }
+    for i, (kind, cfg, weights) in enumerate(layers):
+        arrays[f"{i}_kernel"] = weights["kernel"].astype(np.float32)
+        arrays[f"{i}_bias"] = weights["bias"].astype(np.float32)
+        arrays[f"{i}_activation"] = np.array(cfg.get("activation", "linear"))
+        if kind == "LSTM":
+            arrays[f"{i}_recurrent_kernel"] = weights["recurrent_kernel"].astype(np.float32)
+            arrays[f"{i}_recurrent_activation"] = np.array(cfg.get("recurrent_activation", "sigmoid"))
+            arrays[f"{i}_return_sequences"] = np.bool_(cfg.get("return_sequences", False))
+
+    tmp_path = npz_path + ".tmp.npz"
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, npz_path)
+    logger.info(f"LSTM 가중치 내보내기: {os.path.basename(npz_path)} "
+                f"({os.path.getsize(npz_path) / 1024:.0f}KB, 층 {'/'.join(arrays['layers'].tolist())})")
+
+class NumpyLSTM:
+    """
+    .npz 가중치로 Keras LSTM/Dense 순전파를 재현합니다.
+
+    LSTM 게이트 순서는 Keras와 같은 i, f, c, o:
+        z = x·W + h·U + b
+        i, f, o = σ(z_i), σ(z_f), σ(z_o);  c̃ = tanh(z_c)
+        c = f ⊙ c + i ⊙ c̃;  h = o ⊙ tanh(c)
+    입력 투영 x·W는 모든 시점을 한 번에 계산하고 시점 루프에서는 h·U만 곱한다.
+    """
+    def __init__(self, layers, source_sha1=None):
+        self.layers = layers
+        self.source_sha1 = source_sha1
+
+    @classmethod
+    def load(cls, npz_path=WEIGHTS_PATH):
+        layers = []
+        with np.load(npz_path) as data:
+            for i, kind in enumerate(data["layers"].tolist()):
+                layer = {
+                    "kind": kind,
+                    "kernel": data[f"{i}_kernel"],
+                    "bias": data[f"{i}_bias"],
+                    "activation": ACTIVATIONS[str(data[f"{i}_activation"])],
+                }
+                if kind == "lstm":
+                    layer["recurrent_kernel"] = data[f"{i}_recurrent_kernel"]
+                    layer["recurrent_activation"] = ACTIVATIONS[str(data[f"{i}_recurrent_activation"])]
+                    layer["return_sequences"] = bool(data[f"{i}_return_sequences"])
+                layers.append(layer)
+            source_sha1 = str(data["source_sha1"])
+        return cls(layers, source_sha1)
+
+    @staticmethod
+    def _lstm(x, layer):
+        batch, steps, _ = x.shape
+        units = layer["recurrent_kernel"].shape[0]
+        act, rec_act = layer["activation"], layer["recurrent_activation"]
+        projected = x @ layer["kernel"] + layer["bias"]  # (B, T, 4u)
+        h = np.zeros((batch, units), dtype=x.dtype)
+        c = np.zeros((batch, units), dtype=x.dtype)
+        outputs = []
+        for t in range(steps):
+            z = projected[:, t] + h @ layer["recurrent_kernel"]
+            i = rec_act(z[:, :units])
+            f = rec_act(z[:, units:2 * units])
+            g = act(z[:, 2 * units:3 * units])
+            o = rec_act(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * act(c)
+            if layer["return_sequences"]:
+                outputs.append(h)
+        return np.stack(outputs, axis=1) if layer["return_sequences"] else h
+
+    def predict(self, inputs):
+        """(B, window, 45) 입력 → (B, 45) 번호별 확률."""
+        x = np.asarray(inputs, dtype=np.float32)
+        for layer in self.layers:
+            if layer["kind"] == "lstm":
+                x = self._lstm(x, layer)
+            else:
+                x = layer["activation"](x @ layer["kernel"] + layer["bias"])
+        return x
+
+class NumpyModelCache:
+    """
+    NumpyLSTM을 프로세스당 한 번만 불러오는 캐시.
+    .h5의 mtime이 바뀌었을 때만 확인하고, .npz가 없거나 다른 .h5에서 나온 것이면(모델 재학습) 먼저 다시 내보낸다.
+    """
+    def __init__(self, h5_path=MODEL_PATH, npz_path=WEIGHTS_PATH):
+        self.h5_path = h5_path
+        self.npz_path = npz_path
+        self._lock = threading.Lock()
+        self._model = None
+        self._h5_mtime = None
+
+    def get(self):
+        """NumpyLSTM (모델 파일이 없으면 None)."""
+        try:
+            h5_mtime = os.stat(self.h5_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if self._model is not None and self._h5_mtime == h5_mtime:
+                return self._model
+            started = time.perf_counter()
+            digest = file_digest(self.h5_path)
+            model = NumpyLSTM.load(self.npz_path) if os.path.exists(self.npz_path) else None
+            if model is None or model.source_sha1 != digest:
+                export_weights(self.h5_path, self.npz_path)
+                model = NumpyLSTM.load(self.npz_path)
+            self._model = model
+            self._h5_mtime = h5_mtime
+            from model_registry import label_for_sha1
+            logger.info(f"AI 모델(NumPy) 로드 완료: {label_for_sha1(digest)}, "
+                        f"{(time.perf_counter() - started) * 1000:.1f}ms")
+            return model
+
+    def predict(self, inputs):
+        model = self.get()
+        return None if model is None else model.predict(inputs)
+
+numpy_model = NumpyModelCache()
+
+if __name__ == "__main__":
+    export_weights()
@@ -180,6 +180,68 @@ def check_winning_job():
 
 from datetime import datetime
 
+def sync_draws_job():
+    """로컬 당첨번호 저장소(lotto_history.csv)에 새로 추첨된 회차만 받아 추가한다.
+    구매 시 번호 생성은 네트워크 없이 저장소만 읽으므로, 구매 전에 미리 동기화해 둔다.
+    """
+    try:
+        from draw_store import draw_store
+        draw_store.sync()
+    except Exception as e:
+        logger.warning(f"당첨번호 동기화 실패(다음 동기화 때 재시도): {e}")
+    try:
+        # 대시보드가 페이지를 열 때 다시 계산하지 않도록 새 회차 기준 통계를 미리 만들어 둔다
+        from stats_engine import stats_engine
+        stats_engine.get()
+        from draw_store import draw_store
+        draw_store.markov_model()  # 전이 행렬 파일에 새 회차 반영
+    except Exception as e:
+        logger.warning(f"통계 갱신 실패: {e}")
+
+def plan_job():
+    """다음 구매 회차의 번호를 미리 확정해 ticket_plan.json에 저장한다.
+    (구매 세션 안에서는 계획만 재생하므로 분석/모델 로드로 로그인 시간이 늘어나지 않음)
+    """
+    set_default_tag("구매계획")
+    config = load_config()
+    if not config:
+        return
+    sync_draws_job()  # 최신 회차 반영 후 계획
+    try:
+        import ticket_plan
+        plan = ticket_plan.build_plan(config.get('games', []))
+        lines = [f"Game {t['id']} ({t['mode']}{', 모델 ' + t['model'] if t.get('model') else ''}): "
+                 f"{t['numbers'] if t['numbers'] else 'Auto'}" for t in plan['tickets']]
+        send_discord_message(f"🗓️ {plan['drw_no']}회 구매 계획 생성\n" + "\n".join(lines))
+    except Exception as e:
+        logger.error(f"구매 계획 생성 실패 (구매 시 즉석 생성): {e}")
+
+def finetune_job():
+    """새로 동기화된 회차로 LSTM 모델을 미세 조정한다. (전체 재학습 없이 새 샘플 + 과거 일부만)
+    TensorFlow를 스케줄러 프로세스에 올리지 않도록 별도 프로세스(train_model.py --finetune)로 실행하며,
+    새 모델 파일은 원자적으로 교체되고 NumPy 가중치는 다음 추론 때 자동으로 다시 내보내진다.
+    """
+    set_default_tag("모델학습")
+    import importlib.util
+    import subprocess
+    import sys
+    if importlib.util.find_spec("tensorflow") is None:
+        logger.info("TensorFlow가 설치되어 있지 않아 모델 미세 조정을 건너뜁니다.")
+        return
+    sync_draws_job()
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "train_model.py")
+    try:
+        result = subprocess.run([sys.executable, script, "--finetune"], cwd=os.path.dirname(script), timeout=3600)
+        if result.returncode != 0:
+            logger.error(f"모델 미세 조정 실패 (종료 코드 {result.returncode})")
+    except Exception as e:
+        logger.error(f"모델 미세 조정 실행 실패: {e}")
+
+def _uses_ai_model(games):
+    """활성 게임 중 LSTM 모델 예측이 필요한 게임이 있는지."""
+    from strategies import uses_ai_model
+    return any(uses_ai_model(g) for g in games if g.get('active', True))
+
 def refresh_status_job():
     """스케줄러 시작 시 1회 로그인하여 예치금/상태를 즉시 갱신한다.
     (봇을 켜면 대시보드에 현재 잔액이 바로 반영되도록)
@@ -237,6 +299,16 @@ def _register_jobs(schedule_config):
         s.at(deposit_time).do(deposit_job)
         logger.info(f"📅 충전 예약: 매주 {deposit_day} {deposit_time}")
 
+    # 구매 계획 (기본: 충전 다음 — 금요일 19:00)
+    plan_day = schedule_config.get('plan_day', deposit_day)
+    plan_time = schedule_config.get('plan_time', '19:00')
+    s = get_scheduler(plan_day)
+    if s:
+        s.at(plan_time).do(plan_job)
+        logger.info(f"📅 구매 계획 예약: 매주 {plan_day} {plan_time}")
+    else:
+        logger.error(f"잘못된 요일 설정(구매 계획): {plan_day}")
+
     # 당첨 확인
     check_day = schedule_config.get('check_day', 'Saturday')
     check_time = schedule_config.get('check_time', '23:00')
@@ -247,6 +319,21 @@ def _register_jobs(schedule_config):
     else:
         logger.error(f"잘못된 요일 설정(당첨확인): {check_day}")
 
+    # AI 모델 미세 조정 (기본: 토요일 추첨 다음 날 — 일요일 10:00)
+    finetune_day = schedule_config.get('finetune_day', 'Sunday')
+    finetune_time = schedule_config.get('finetune_time', '10:00')
+    s = get_scheduler(finetune_day)
+    if s:
+        s.at(finetune_time).do(finetune_job)
+        logger.info(f"📅 모델 미세 조정 예약: 매주 {finetune_day} {finetune_time}")
+    else:
+        logger.error(f"잘못된 요일 설정(모델 미세 조정): {finetune_day}")
+
+    # 당첨번호 동기화 (매일 1회, 새 회차가 없으면 요청 1건으로 끝남)
+    sync_time = schedule_config.get('sync_time', '09:00')
+    schedule.every().day.at(sync_time).do(sync_draws_job)
+    logger.info(f"📅 당첨번호 동기화 예약: 매일 {sync_time}")
+
 def run_scheduler():
     set_default_tag("봇")
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -265,6 +352,23 @@ def run_scheduler():
         logger.warning(f"시작 시 갱신 중 예외(무시): {e}")
     set_default_tag("봇")  # refresh_status_job이 바꾼 태그 복원
 
+    # 시작 시 당첨번호 저장소 동기화 (구매 시점에는 네트워크 조회를 하지 않음)
+    sync_draws_job()
+
+    # AI 모델을 쓰는 게임이 있으면 미리 준비 (구매/계획 시점의 로드 지연 제거)
+    if _uses_ai_model(config.get('games', [])):
+        from model_cache import preload_ai
+        preload_ai()
+
+    # 이번 회차 구매 계획이 아직 없으면 바로 생성 (봇을 금요일 이후에 켠 경우)
+    try:
+        import ticket_plan
+        if ticket_plan.get_plan() is None:
+            plan_job()
+            set_default_tag("봇")
+    except Exception as e:
+        logger.warning(f"시작 시 구매 계획 확인 실패(무시): {e}")
+
     # 스케줄 등록 (핫리로드를 위해 현재 schedule 설정을 추적)
     current_schedule_cfg = config['schedule']
     _register_jobs(current_schedule_cfg)
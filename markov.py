@@ -0,0 +1,127 @@
+import os
+import numpy as np
+from loguru import logger
+from draw_matrix import HISTORY_FILE
+
+def markov_path(csv_path=HISTORY_FILE):
+    """전이 행렬 파일 경로 (CSV와 같은 폴더의 lotto_markov.npz)."""
+    return os.path.join(os.path.dirname(os.path.abspath(csv_path)), "lotto_markov.npz")
+
+def _one_hot(numbers):
+    numbers = np.asarray(numbers, dtype=np.intp)
+    hits = np.zeros((len(numbers), 45), dtype=np.int64)
+    hits[np.arange(len(numbers))[:, None], numbers - 1] = 1
+    return hits
+
+class MarkovModel:
+    """
+    번호 전이 행렬: t회차에 번호 i가 나왔을 때 t+1회차에 번호 j가 나온 횟수 (45×45).
+
+    transitions[i, j] / occurrences[i] = P(j가 다음 회차에 나옴 | i가 이번 회차에 나옴).
+    새 회차 하나는 직전 회차 6개 × 새 회차 6개 = 36칸만 더하면 되므로 전체 재계산이 없고,
+    예측은 최신 회차 one-hot 벡터와 확률 행렬의 곱 한 번이다.
+    """
+    def __init__(self):
+        self.transitions = np.zeros((45, 45), dtype=np.int64)
+        self.occurrences = np.zeros(45, dtype=np.int64)
+        self.drw_nos = np.zeros(0, dtype=np.int32)
+        self.last_numbers = np.zeros(0, dtype=np.uint8)
+        self._probabilities = None
+
+    def __len__(self):
+        return len(self.drw_nos)
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        model = cls()
+        model.extend(matrix.main, matrix.drw_nos)
+        return model
+
+    def extend(self, numbers, drw_nos):
+        """(M, 6) 당첨번호와 회차 번호를 이어 붙이며 직전 회차 → 새 회차 전이를 누적합니다."""
+        numbers = np.asarray(numbers)
+        if len(numbers) == 0:
+            return
+        chain = numbers if len(self.last_numbers) == 0 else np.vstack([self.last_numbers[None, :], numbers])
+        hits = _one_hot(chain)
+        self.transitions += hits[:-1].T @ hits[1:]
+        self.occurrences += hits[:-1].sum(axis=0)
+        self.drw_nos = np.concatenate([self.drw_nos, np.asarray(drw_nos, dtype=np.int32)])
+        self.last_numbers = np.asarray(numbers[-1], dtype=np.uint8)
+        self._probabilities = None
+
+    def catch_up(self, matrix):
+        """
+        DrawMatrix에 새로 추가된 회차만 반영합니다.
+        기존 구간이 matrix와 어긋나면(이력 재수집 등) 처음부터 다시 만듭니다.
+        """
+        n = len(self)
+        if n > len(matrix) or (n and matrix.drw_nos[n - 1] != self.drw_nos[-1]):
+            return MarkovModel.from_matrix(matrix)
+        if len(matrix) > n:
+            self.extend(matrix.main[n:], matrix.drw_nos[n:])
+        return self
+
+    def probabilities(self):
+        """행 정규화 전이 확률 (45×45). 전이 기록이 없는 번호는 균등 확률(6/45)."""
+        if self._probabilities is None:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                p = self.transitions / self.occurrences[:, None]
+            p[self.occurrences == 0] = 6 / 45
+            self._probabilities = p
+        return self._probabilities
+
+    def predict(self, numbers=None):
+        """
+        주어진 회차(기본: 최신 회차) 번호 다음에 나올 번호별 점수 (45,).
+        각 번호의 전이 확률 평균 = one-hot 벡터 · 확률 행렬 / 6.
+        """
+        numbers = self.last_numbers if numbers is None else np.asarray(numbers)
+        if len(numbers) == 0:
+            return np.full(45, 6 / 45)
+        x = np.zeros(45)
+        x[np.asarray(numbers, dtype=np.intp) - 1] = 1
+        return x @ self.probabilities() / len(numbers)
+
+    def ranking(self, numbers=None):
+        """예측 점수 내림차순 45개 번호 (동률이면 작은 번호 우선)."""
+        return [int(i) + 1 for i in np.argsort(-self.predict(numbers), kind='stable')]
+
+    def save(self, path):
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, transitions=self.transitions, occurrences=self.occurrences,
+                 drw_nos=self.drw_nos, last_numbers=self.last_numbers)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        model = cls()
+        with np.load(path) as data:
+            model.transitions = data["transitions"]
+            model.occurrences = data["occurrences"]
+            model.drw_nos = data["drw_nos"]
+            model.last_numbers = data["last_numbers"]
+        return model
+
+def load_markov(matrix, csv_path=HISTORY_FILE):
+    """
+    저장된 전이 행렬을 불러와 matrix의 새 회차만 반영하고, 바뀌었으면 다시 저장합니다.
+    파일이 없거나 깨졌으면 전체 이력으로 새로 만든다.
+    """
+    path = markov_path(csv_path)
+    model = None
+    if os.path.exists(path):
+        try:
+            model = MarkovModel.load(path)
+        except Exception as e:
+            logger.warning(f"전이 행렬 파일 로드 실패, 새로 생성합니다: {e}")
+    before = (len(model), int(model.drw_nos[-1])) if model is not None and len(model) else None
+    model = model.catch_up(matrix) if model is not None else MarkovModel.from_matrix(matrix)
+    after = (len(model), int(model.drw_nos[-1])) if len(model) else None
+    if after != before:
+        try:
+            model.save(path)
+            logger.debug(f"전이 행렬 저장: {len(model)}회차 (최신 {after[1]}회)")
+        except OSError as e:
+            logger.warning(f"전이 행렬 저장 실패: {e}")
+    return model
@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+import numpy as np
+from loguru import logger
+from draw_matrix import BASE_DIR
+
+MODEL_PATH = os.path.join(BASE_DIR, "lotto_model.h5")
+# AI 추론 방식: 'numpy' (기본, TensorFlow import 없음 — lstm_numpy) / 'tensorflow'
+AI_BACKEND = os.getenv("AI_BACKEND", "numpy").lower()
+
+def _rss_mb():
+    """현재 프로세스 RSS (MB). psutil이 없으면 None."""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
+    except Exception:
+        return None
+
+class ModelCache:
+    """
+    프로세스 안에서 한 번만 로드해 재사용하는 Keras 모델 캐시.
+
+    - 첫 사용 시(또는 preload()로 백그라운드에서 미리) 로드하고, 모델 파일의 mtime이 바뀔 때만 다시 로드
+    - 예측은 tf.function으로 감싼 호출을 재사용해 매번 그래프를 새로 만들지 않음
+    - 로드 시간과 RSS 증가량을 로그로 남김
+    """
+    def __init__(self, path=MODEL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._model = None
+        self._predict = None
+        self._mtime = None
+        self._preload_thread = None
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _load(self, mtime):
+        rss_before = _rss_mb()
+        started = time.perf_counter()
+        import tensorflow as tf
+        from tensorflow.keras.models import load_model
+        imported = time.perf_counter()
+        model = load_model(self.path)
+        predict = tf.function(lambda x: model(x, training=False), reduce_retracing=True)
+        self._model, self._predict, self._mtime = model, predict, mtime
+        elapsed = time.perf_counter() - started
+        rss_after = _rss_mb()
+        memory = f", RSS {rss_after:.0f}MB (+{rss_after - rss_before:.0f}MB)" if rss_after is not None else ""
+        from model_registry import serving_version
+        logger.info(f"AI 모델 로드 완료: {os.path.basename(self.path)} ({serving_version.label()}) "
+                    f"{elapsed:.2f}s (TensorFlow import {imported - started:.2f}s){memory}")
+
+    def get(self):
+        """로드된 모델 (파일이 없으면 None). 파일이 갱신되었으면 다시 로드한다."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if self._model is None or self._mtime != mtime:
+                if self._model is not None:
+                    logger.info("AI 모델 파일이 변경되어 다시 로드합니다.")
+                self._load(mtime)
+            return self._model
+
+    def predict(self, inputs):
+        """(B, window, 45) 입력 → (B, 45) 예측. 모델 파일이 없으면 None."""
+        if self.get() is None:
+            return None
+        import tensorflow as tf
+        with self._lock:
+            predict = self._predict
+        return predict(tf.constant(np.asarray(inputs, dtype=np.float32))).numpy()
+
+    def preload(self):
+        """백그라운드 스레드에서 미리 로드합니다. (스케줄러 시작 시 호출, 이미 로드 중이면 무시)"""
+        if not self.exists() or (self._preload_thread and self._preload_thread.is_alive()):
+            return
+        def run():
+            try:
+                self.get()
+            except Exception as e:
+                logger.warning(f"AI 모델 미리 로드 실패 (사용 시 다시 시도): {e}")
+        self._preload_thread = threading.Thread(target=run, name="model-preload", daemon=True)
+        self._preload_thread.start()
+
+model_cache = ModelCache()
+
+def predict_ai(inputs):
+    """
+    설정된 추론 방식으로 (B, window, 45) → (B, 45) 예측. 모델 파일이 없으면 None.
+    NumPy 추론이 실패하면(가중치 내보내기 불가 등) TensorFlow 경로로 대체한다.
+    """
+    if AI_BACKEND == "numpy":
+        try:
+            from lstm_numpy import numpy_model
+            return numpy_model.predict(inputs)
+        except Exception as e:
+            logger.warning(f"NumPy 추론 실패, TensorFlow로 대체합니다: {e}")
+    return model_cache.predict(inputs)
+
+def ai_model_version():
+    """지금 AI 예측에 쓰이는 모델의 버전 라벨 ('v3', 보관소에 없는 파일이면 'unregistered'). 모델이 없으면 None."""
+    from model_registry import serving_version
+    return serving_version.label()
+
+def preload_ai():
+    """스케줄러 시작 시 호출: NumPy 가중치는 바로(수 ms), TensorFlow 모델은 백그라운드에서 미리 로드."""
+    if AI_BACKEND == "numpy":
+        try:
+            from lstm_numpy import numpy_model
+            if numpy_model.get() is not None:
+                return
+        except Exception as e:
+            logger.warning(f"NumPy 가중치 준비 실패, TensorFlow 모델을 미리 로드합니다: {e}")
+    model_cache.preload()
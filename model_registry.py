@@ -0,0 +1,358 @@
+import json
+import os
+import re
+import shutil
+import threading
+from datetime import datetime
+import numpy as np
+from loguru import logger
+from draw_matrix import BASE_DIR
+
+# 버전별 LSTM 모델 보관소.
+#   models/v0003/lotto_model.h5   서비스용 모델 (데이터 마지막 회차까지 학습)
+#   models/v0003/gate.h5          승격 평가용 모델 (같은 방식으로 학습하되 최근 EVAL_DRAWS회차는 제외)
+#   models/v0003/*.npz            평가용으로 내보낸 NumPy 가중치
+#   models/v0003/meta.json        학습 범위, 데이터 기준 회차, 검증 지표, 해시/크기, 평가 점수, 상태
+#   models/current.json           현재 서비스 중인 버전 (원자적으로 교체)
+# 서비스 경로(lotto_model.h5)는 현재 버전의 복사본이며 승격할 때만 바뀐다.
+# gate.h5가 없는 버전(legacy)은 서비스용 모델 자체를 학습 범위(trained_through) 이후 회차로 평가한다.
+REGISTRY_DIR = os.path.join(BASE_DIR, "models")
+CURRENT_FILE = os.path.join(REGISTRY_DIR, "current.json")
+SERVING_PATH = os.path.join(BASE_DIR, "lotto_model.h5")
+WINDOW_SIZE = 10          # train_model.py의 WINDOW_SIZE와 동일
+EVAL_DRAWS = 52           # 워크포워드 평가 구간 (최근 1년). 평가용 모델만 이 구간을 정답으로 쓰지 않는다
+PROMOTE_TOLERANCE = 0.01  # 후보의 log loss가 현재 모델보다 1% 넘게 나쁘면 승격 거부
+MIN_EVAL_DRAWS = 10       # 승격 판단에 필요한 최소 평가 회차 수
+
+_VERSION_DIR = re.compile(r"^v(\d+)$")
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"모델 메타데이터 읽기 실패 ({os.path.basename(path)}): {e}")
+        return None
+
+def _write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+def version_label(version):
+    return f"v{version}" if version is not None else None
+
+def version_dir(version):
+    return os.path.join(REGISTRY_DIR, f"v{int(version):04d}")
+
+def model_path(version):
+    return os.path.join(version_dir(version), "lotto_model.h5")
+
+def list_versions():
+    """등록된 버전 번호 (오름차순)."""
+    if not os.path.isdir(REGISTRY_DIR):
+        return []
+    versions = []
+    for name in os.listdir(REGISTRY_DIR):
+        match = _VERSION_DIR.match(name)
+        if match and os.path.exists(os.path.join(REGISTRY_DIR, name, "meta.json")):
+            versions.append(int(match.group(1)))
+    return sorted(versions)
+
+def get_meta(version):
+    return _read_json(os.path.join(version_dir(version), "meta.json"))
+
+def _save_meta(meta):
+    _write_json(os.path.join(version_dir(meta["version"]), "meta.json"), meta)
+
+def current_version():
+    pointer = _read_json(CURRENT_FILE)
+    return int(pointer["version"]) if pointer and pointer.get("version") is not None else None
+
+def current_meta():
+    """현재 서비스 중인 버전의 메타데이터 (없으면 빈 dict)."""
+    version = current_version()
+    return (get_meta(version) or {}) if version is not None else {}
+
+def gate_path(version):
+    return os.path.join(version_dir(version), "gate.h5")
+
+def _place(src, target):
+    """같은 파일시스템의 임시 파일은 이동, 그 외는 복사."""
+    if os.path.basename(src).endswith(".tmp.h5"):
+        os.replace(src, target)
+    else:
+        shutil.copy2(src, target)
+
+def register(h5_path, info, gate_h5_path=None):
+    """
+    학습된 모델 파일을 새 버전으로 등록합니다. (상태 'candidate', 서비스 경로는 건드리지 않음)
+
+    Args:
+        info (dict): 학습 정보 (mode, base_version, trained_from, trained_through, data_through, draws,
+            samples, epochs, metrics, gate). gate는 평가용 모델의 {"trained_through", ...}
+        gate_h5_path (str): 평가용 모델 파일 (없으면 서비스용 모델 자체로 평가)
+
+    Returns:
+        dict: 저장된 메타데이터
+    """
+    from lstm_numpy import file_digest
+    versions = list_versions()
+    version = (versions[-1] if versions else 0) + 1
+    os.makedirs(version_dir(version), exist_ok=True)
+    target = model_path(version)
+    _place(h5_path, target)
+    if gate_h5_path:
+        _place(gate_h5_path, gate_path(version))
+        info = {**info, "gate": {**info.get("gate", {}), "sha1": file_digest(gate_path(version))}}
+    meta = {
+        "version": version,
+        "created_at": _now(),
+        **info,
+        "sha1": file_digest(target),
+        "size": os.path.getsize(target),
+        "status": "candidate",
+    }
+    _save_meta(meta)
+    logger.info(f"모델 등록: {version_label(version)} ({info.get('mode')}, ~{info.get('trained_through')}회, "
+                f"{meta['size'] / 1024:.0f}KB)")
+    return meta
+
+def eval_start(matrix, draws=EVAL_DRAWS):
+    """평가 구간(최근 draws회차)의 첫 위치. 평가용 모델은 이 위치 이전 회차만 정답으로 쓴다."""
+    return max(WINDOW_SIZE, len(matrix) - draws)
+
+def gate_info(meta):
+    """
+    버전의 평가용 모델 (파일 경로, 학습 마지막 회차, SHA-1).
+    gate.h5가 없으면 서비스용 모델과 그 학습 범위를 그대로 쓴다. (학습 범위를 모르면 회차는 None)
+    """
+    gate = meta.get("gate")
+    if gate and os.path.exists(gate_path(meta["version"])):
+        return gate_path(meta["version"]), gate.get("trained_through"), gate.get("sha1")
+    return model_path(meta["version"]), meta.get("trained_through"), meta.get("sha1")
+
+def walk_forward(model, matrix, after, draws=EVAL_DRAWS):
+    """
+    평가 구간(최근 draws회차) 중 after회 이후 회차 각각을 '그 이전 10회차만' 입력으로 예측해 채점합니다.
+    after는 모델이 학습한 마지막 회차 이상이어야 한다. (학습에 쓰인 회차로 채점하지 않도록)
+
+        log_loss         : 번호별 이진 교차 엔트로피 평균 (낮을수록 좋음, 승격 기준)
+        baseline_log_loss: 모든 번호를 6/45로 예측했을 때의 값
+        mean_matches     : 예측 상위 6개 중 실제 당첨번호 개수 평균 (무작위 기대값 0.8)
+
+    Args:
+        model: NumpyLSTM (predict(B, window, 45) → (B, 45))
+
+    Returns:
+        dict: 평가 결과 (채점할 회차가 없으면 None)
+    """
+    n = len(matrix)
+    positions = np.arange(eval_start(matrix, draws), n)
+    positions = positions[matrix.drw_nos[positions] > after]
+    if len(positions) == 0:
+        return None
+    one_hot = np.zeros((n, 45), dtype=np.float32)
+    one_hot[np.arange(n)[:, None], matrix.main.astype(np.intp) - 1] = 1
+    windows = np.stack([one_hot[t - WINDOW_SIZE:t] for t in positions])
+    prob = np.clip(model.predict(windows).astype(np.float64), 1e-7, 1 - 1e-7)
+    target = one_hot[positions]
+    log_loss = -np.mean(target * np.log(prob) + (1 - target) * np.log(1 - prob))
+    top = np.argpartition(-prob, 6, axis=1)[:, :6]
+    matches = np.take_along_axis(target, top, axis=1).sum(axis=1)
+    p0 = 6 / 45
+    drw_nos = matrix.drw_nos[positions]
+    return {
+        "draws": int(len(positions)),
+        "from": int(drw_nos[0]),
+        "to": int(drw_nos[-1]),
+        "log_loss": float(log_loss),
+        "baseline_log_loss": float(-(p0 * np.log(p0) + (1 - p0) * np.log(1 - p0))),
+        "mean_matches": float(matches.mean()),
+        "evaluated_at": _now(),
+    }
+
+def evaluate(version, after, matrix=None, draws=EVAL_DRAWS):
+    """등록된 버전의 평가용 모델을 NumPy 순전파로 after회 이후 회차에 대해 평가합니다. (TensorFlow 불필요)"""
+    from lstm_numpy import NumpyLSTM, export_weights
+    from draw_matrix import load_draw_matrix
+    matrix = matrix if matrix is not None else load_draw_matrix()
+    h5_path = gate_info(get_meta(version))[0]
+    npz_path = os.path.splitext(h5_path)[0] + ".npz"
+    if not os.path.exists(npz_path):
+        export_weights(h5_path, npz_path)
+    return walk_forward(NumpyLSTM.load(npz_path), matrix, after, draws)
+
+def _record_evaluation(version, evaluation, reference=None):
+    meta = get_meta(version)
+    meta["evaluation"] = evaluation
+    if reference is not None:
+        meta["evaluation"]["reference"] = reference
+    _save_meta(meta)
+
+def _set_current(meta):
+    """서비스 경로에 해당 버전을 복사해 넣고(임시 파일 → os.replace) current.json을 바꿉니다."""
+    tmp_path = SERVING_PATH + ".tmp"
+    shutil.copy2(model_path(meta["version"]), tmp_path)
+    os.replace(tmp_path, SERVING_PATH)
+    previous = current_version()
+    _write_json(CURRENT_FILE, {"version": meta["version"], "promoted_at": _now()})
+    if previous is not None and previous != meta["version"]:
+        old = get_meta(previous)
+        if old:
+            old["status"] = "retired"
+            _save_meta(old)
+    meta["status"] = "current"
+    meta["promoted_at"] = _now()
+    _save_meta(meta)
+
+def _reject(version, reason):
+    meta = get_meta(version)
+    meta["status"] = "rejected"
+    meta["rejected_reason"] = reason
+    _save_meta(meta)
+    logger.warning(f"모델 {version_label(version)} 승격 거부: {reason}")
+    return False
+
+def promote(version, force=False):
+    """
+    후보 버전을 워크포워드 평가해 현재 모델보다 나쁘지 않을 때만 서비스 모델로 승격합니다.
+
+    서비스용 모델은 최신 회차까지 학습하므로 채점에는 각 버전의 평가용 모델(gate)을 쓴다.
+    두 평가용 모델 모두 학습하지 않은 평가 구간 회차로 채점해 비교하고, 그런 회차가 MIN_EVAL_DRAWS개
+    미만이면 후보가 학습하지 않은 회차에서 '모든 번호 6/45' 기준선보다 나쁘지 않은지만 본다.
+    두 버전의 평가용 모델이 같은 파일이면(새 회차가 모두 평가 구간 안이라 평가용 모델이 그대로인 미세 조정)
+    비교할 것이 없으므로 승격한다. 현재 모델이 없거나 force면 바로 승격.
+
+    Returns:
+        bool: 승격 여부
+    """
+    from draw_matrix import load_draw_matrix
+    matrix = load_draw_matrix()
+    label = version_label(version)
+    _, cand_through, cand_sha1 = gate_info(get_meta(version))
+    if not cand_through and not force:
+        return _reject(version, "학습 범위(trained_through) 없음")
+    current = current_version()
+    candidate = evaluate(version, cand_through or matrix.latest_drw_no, matrix)
+
+    if current is not None and current != version and not force:
+        _, cur_through, cur_sha1 = gate_info(current_meta())
+        cur_through = cur_through or matrix.latest_drw_no  # 모르면 전부 학습한 것으로 취급
+        after = max(int(cand_through), int(cur_through))
+        shared = evaluate(version, after, matrix) if cand_sha1 != cur_sha1 else None
+        if cand_sha1 == cur_sha1:
+            reference = None
+            logger.info(f"모델 {label}의 평가용 모델이 {version_label(current)}와 같아 비교 없이 승격합니다.")
+        elif shared is not None and shared["draws"] >= MIN_EVAL_DRAWS:
+            candidate = shared
+            reference = evaluate(current, after, matrix)["log_loss"]
+            name = version_label(current)
+        elif candidate is not None and candidate["draws"] >= MIN_EVAL_DRAWS:
+            reference = candidate["baseline_log_loss"]
+            name = "6/45 기준선"
+        else:
+            return _reject(version, f"학습하지 않은 평가 회차가 {MIN_EVAL_DRAWS}개 미만")
+        if reference is not None:
+            _record_evaluation(version, candidate, {"name": name, "log_loss": reference})
+            limit = reference * (1 + PROMOTE_TOLERANCE)
+            if not np.isfinite(candidate["log_loss"]) or candidate["log_loss"] > limit:
+                return _reject(version, f"log loss {candidate['log_loss']:.4f} > {name} {reference:.4f} "
+                                        f"(+{PROMOTE_TOLERANCE:.0%} 허용, {candidate['from']}~{candidate['to']}회)")
+        elif candidate is not None:
+            _record_evaluation(version, candidate)
+    elif candidate is not None:
+        _record_evaluation(version, candidate)
+
+    _set_current(get_meta(version))
+    if candidate is not None:
+        logger.success(f"모델 {label} 승격: log loss {candidate['log_loss']:.4f}, 상위 6개 평균 적중 "
+                       f"{candidate['mean_matches']:.2f}개 (학습 외 {candidate['from']}~{candidate['to']}회)")
+    else:
+        logger.success(f"모델 {label} 승격 (평가 없이)")
+    return True
+
+def bootstrap(trained_through=None):
+    """
+    보관소가 비어 있으면 지금 서비스 중인 lotto_model.h5를 첫 버전('legacy')으로 등록해 현재 버전으로 지정합니다.
+    (후보 모델과 비교할 기준이 생기도록 학습 전에 호출)
+
+    Args:
+        trained_through (int): 기존 모델이 학습한 마지막 회차. 파일만으로는 알 수 없으므로 명시해야
+            미세 조정/백테스트가 학습 이후 회차를 구분할 수 있다. 이미 등록된 legacy 버전에 값이
+            없으면 채워 넣는다.
+    """
+    if not list_versions():
+        if not os.path.exists(SERVING_PATH):
+            return
+        info = {"mode": "legacy"}
+        if trained_through:
+            info["trained_through"] = int(trained_through)
+        _set_current(register(SERVING_PATH, info))
+        return
+    meta = current_meta()
+    if trained_through and meta and not meta.get("trained_through"):
+        meta["trained_through"] = int(trained_through)
+        _save_meta(meta)
+        logger.info(f"모델 {version_label(meta['version'])} 학습 범위 기록: ~{int(trained_through)}회")
+
+class _ServingVersion:
+    """lotto_model.h5가 어느 등록 버전인지 (SHA-1로 대조, 파일 mtime이 바뀔 때만 다시 계산)."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._label = None
+
+    def label(self):
+        """'v3' 형식 (등록되지 않은 파일이면 'unregistered', 모델이 없으면 None)."""
+        try:
+            mtime = os.stat(SERVING_PATH).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if self._mtime != mtime:
+                from lstm_numpy import file_digest
+                self._label = label_for_sha1(file_digest(SERVING_PATH))
+                self._mtime = mtime
+            return self._label
+
+def label_for_sha1(digest):
+    """모델 파일 해시에 해당하는 버전 라벨 (현재 버전 우선, 없으면 'unregistered')."""
+    current = current_version()
+    for version in ([current] if current is not None else []) + list_versions()[::-1]:
+        meta = get_meta(version)
+        if meta and meta.get("sha1") == digest:
+            return version_label(version)
+    return "unregistered"
+
+serving_version = _ServingVersion()
+
+if __name__ == "__main__":
+    import sys
+    # python model_registry.py                  : 버전 목록
+    # python model_registry.py bootstrap 1150   : 기존 lotto_model.h5를 '~1150회 학습' 버전으로 등록
+    # python model_registry.py promote 3        : 평가 후 승격 (--force: 평가 비교 없이)
+    if len(sys.argv) >= 3 and sys.argv[1] == "promote":
+        bootstrap()
+        promote(int(sys.argv[2]), force="--force" in sys.argv)
+    elif len(sys.argv) >= 2 and sys.argv[1] == "bootstrap":
+        bootstrap(int(sys.argv[2]) if len(sys.argv) >= 3 else None)
+        print(current_meta())
+    else:
+        bootstrap()
+        current = current_version()
+        for v in list_versions():
+            meta = get_meta(v)
+            ev = meta.get("evaluation") or {}
+            loss = f"{ev['log_loss']:.4f}" if ev else "-"
+            mark = "*" if v == current else " "
+            gate = (meta.get("gate") or {}).get("trained_through", "-")
+            print(f"{mark} {version_label(v):<6}{meta.get('status', ''):<11}{meta.get('mode', ''):<10}"
+                  f"~{meta.get('trained_through', '?')}회 (데이터 ~{meta.get('data_through', '?')}회, 평가용 ~{gate}회)  "
+                  f"log_loss {loss}  {meta.get('created_at', '')}")
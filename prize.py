@@ -0,0 +1,84 @@
+import numpy as np
+from draw_matrix import numbers_to_masks
+
+TICKET_PRICE = 1000  # 1게임 1,000원
+
+# 등수별 당첨금 (원). 4등/5등은 고정 금액, 1~3등은 판매량에 따라 매회 달라지므로 평균적인 추정치.
+PRIZE_AMOUNTS = {1: 2_000_000_000, 2: 55_000_000, 3: 1_500_000, 4: 50_000, 5: 5_000}
+
+# (일치 개수 * 2 + 보너스 일치) → 등수 (0 = 낙첨)
+# 6개 일치 = 1등, 5개+보너스 = 2등, 5개 = 3등, 4개 = 4등, 3개 = 5등
+_TIER_LUT = np.zeros(14, dtype=np.uint8)
+_TIER_LUT[[12, 13]] = 1
+_TIER_LUT[11] = 2
+_TIER_LUT[10] = 3
+_TIER_LUT[[8, 9]] = 4
+_TIER_LUT[[6, 7]] = 5
+
+# 등수 인덱스(0~5) → 당첨금
+_AMOUNT_LUT = np.array([0] + [PRIZE_AMOUNTS[t] for t in range(1, 6)], dtype=np.int64)
+
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+def popcount64(x):
+    """uint64 배열의 원소별 1비트 개수."""
+    x = np.asarray(x, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):  # NumPy 2.0+
+        return np.bitwise_count(x)
+    # SWAR 방식 (구버전 NumPy 대응)
+    x = x - ((x >> np.uint64(1)) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return ((x * _H01) >> np.uint64(56)).astype(np.uint8)
+
+def _as_masks(tickets):
+    """(K, 6) 번호 배열이면 마스크로 변환하고, 이미 uint64 마스크(K,)면 그대로 사용."""
+    arr = np.asarray(tickets)
+    if arr.dtype == np.uint64 and arr.ndim == 1:
+        return arr
+    return numbers_to_masks(arr.reshape(-1, arr.shape[-1]))
+
+def _bonus_bits(bonus):
+    return np.left_shift(np.uint64(1), np.asarray(bonus, dtype=np.uint64) - np.uint64(1))
+
+def _tiers(t, d, bonus_bit):
+    """브로드캐스팅 가능한 마스크 배열끼리 등수를 계산합니다."""
+    matches = popcount64(t & d).astype(np.uint8)
+    bonus_hit = (t & bonus_bit) != 0
+    return _TIER_LUT[matches * 2 + bonus_hit]
+
+def evaluate(tickets, draws, bonus):
+    """
+    티켓 묶음을 여러 회차 당첨번호와 한 번에 대조하여 등수를 구합니다.
+
+    Args:
+        tickets: (T, 6) 번호 배열 또는 (T,) uint64 마스크
+        draws: (D, 6) 당첨번호 배열 또는 (D,) uint64 마스크
+        bonus: (D,) 보너스 번호
+
+    Returns:
+        np.ndarray: (T, D) uint8 등수 (1~5, 낙첨은 0)
+    """
+    t = _as_masks(tickets)
+    d = _as_masks(draws)
+    return _tiers(t[:, None], d[None, :], _bonus_bits(bonus)[None, :])
+
+def evaluate_aligned(tickets, draws, bonus):
+    """
+    i번째 티켓을 i번째 회차와만 대조합니다. (회차별로 다른 티켓을 사는 백테스트용)
+
+    Returns:
+        np.ndarray: (K,) uint8 등수
+    """
+    return _tiers(_as_masks(tickets), _as_masks(draws), _bonus_bits(bonus))
+
+def tier_counts(tiers):
+    """등수 배열 → 길이 6 카운트 ([낙첨, 1등, 2등, 3등, 4등, 5등])."""
+    return np.bincount(np.asarray(tiers).ravel(), minlength=6)[:6]
+
+def prize_amounts(tiers):
+    """등수 배열 → 같은 모양의 당첨금 배열 (원)."""
+    return _AMOUNT_LUT[tiers]
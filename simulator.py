@@ -0,0 +1,151 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from loguru import logger
+import prize
+import ticket_codec
+from draw_matrix import BASE_DIR, numbers_to_masks
+
+CONFIG_PATH = os.path.join(BASE_DIR, 'config.json')
+BATCH_SIZE = 500_000  # 워커가 한 번에 만드는 가상 추첨 수 (메모리 ≈ 게임 수 × 배치 바이트)
+
+def random_draws(rng, count):
+    """
+    가상 추첨 count회: (count,) uint64 당첨번호 마스크와 (count,) 보너스 번호.
+    당첨번호는 조합 순위를 균등 추출해 복원하고, 보너스는 남은 39개 중 하나를 벡터 연산으로 고른다.
+    """
+    numbers = ticket_codec.unrank(rng.integers(0, ticket_codec.TOTAL_COMBINATIONS, size=count))
+    # 남은 39개 중 r번째 번호: r+1에서 시작해 오름차순 당첨번호를 지날 때마다 1씩 민다
+    bonus = rng.integers(1, 40, size=count, dtype=np.int64)
+    for j in range(6):
+        bonus += bonus >= numbers[:, j]
+    return numbers_to_masks(numbers), bonus
+
+def _simulate_chunk(ticket_masks, draws, seed_seq):
+    """
+    독립 시드 스트림 하나로 draws회 시뮬레이션한 부분 집계.
+
+    Returns:
+        dict: tier_counts (T, 6), 회차당 총 당첨금의 합/제곱합, 회차 수
+    """
+    rng = np.random.default_rng(seed_seq)
+    tickets = np.asarray(ticket_masks, dtype=np.uint64)
+    counts = np.zeros((len(tickets), 6), dtype=np.int64)
+    total = 0.0
+    total_sq = 0.0
+    any_win = 0
+    done = 0
+    while done < draws:
+        size = min(BATCH_SIZE, draws - done)
+        masks, bonus = random_draws(rng, size)
+        tiers = prize.evaluate(tickets, masks, bonus)  # (T, size)
+        for i in range(len(tickets)):
+            counts[i] += np.bincount(tiers[i], minlength=6)[:6]
+        winnings = prize.prize_amounts(tiers).sum(axis=0).astype(np.float64)
+        total += winnings.sum()
+        total_sq += np.dot(winnings, winnings)
+        any_win += int((tiers > 0).any(axis=0).sum())
+        done += size
+    return {"counts": counts, "total": total, "total_sq": total_sq, "any_win": any_win, "draws": draws}
+
+def load_games(config_path=CONFIG_PATH):
+    """config.json의 활성 게임 목록."""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    return [g for g in config.get('games', []) if g.get('active', True)]
+
+def tickets_for(games, rng=None):
+    """
+    게임 설정 → 이번 주 구매할 (T, 6) 번호.
+    사이트 자동선택('auto')이나 덜 채워진 반자동 게임은 남은 번호를 균등 랜덤으로 채운다.
+    (공정한 추첨에서는 어떤 고정 조합이든 기대값이 같으므로, 결과 차이는 게임 간 번호 겹침에서 나온다)
+    """
+    import strategies
+    rng = rng if rng is not None else np.random.default_rng()
+    tickets = []
+    for ticket in strategies.generate_batch(games):
+        numbers = list(ticket['numbers'] or [])
+        if len(numbers) < 6:
+            pool = np.setdiff1d(np.arange(1, 46), numbers)
+            numbers += rng.choice(pool, 6 - len(numbers), replace=False).tolist()
+        tickets.append(sorted(int(n) for n in numbers))
+    return np.array(tickets, dtype=np.uint8)
+
+def simulate(tickets, draws=10_000_000, max_workers=None, seed=None, chunks_per_worker=2):
+    """
+    고정된 티켓 묶음을 draws회의 가상 추첨과 대조해 기대 수익과 분산, 등수별 확률을 구합니다.
+
+    SeedSequence.spawn으로 작업마다 독립 난수 스트림을 만들어 프로세스 풀에 나눠 준다.
+    같은 seed + 같은 작업 분할이면 결과가 재현된다.
+
+    Args:
+        tickets: (T, 6) 번호 배열
+        draws (int): 가상 추첨 횟수
+        max_workers (int): 프로세스 수 (기본 CPU 코어 수)
+        seed (int): 재현용 시드 (None이면 매번 다름)
+
+    Returns:
+        dict: 회차(1주)당 기대 당첨금/순수익/분산/표준편차, 게임별 등수 확률, 당첨 확률
+    """
+    tickets = np.asarray(tickets)
+    ticket_masks = numbers_to_masks(tickets)
+    max_workers = max_workers or os.cpu_count() or 1
+    n_chunks = max_workers * chunks_per_worker
+    sizes = [draws // n_chunks + (1 if i < draws % n_chunks else 0) for i in range(n_chunks)]
+    streams = np.random.SeedSequence(seed).spawn(n_chunks)
+    started = time.perf_counter()
+
+    if max_workers == 1:
+        parts = [_simulate_chunk(ticket_masks, size, ss) for size, ss in zip(sizes, streams) if size]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_simulate_chunk, ticket_masks, size, ss)
+                       for size, ss in zip(sizes, streams) if size]
+            parts = [f.result() for f in futures]
+
+    counts = sum(p["counts"] for p in parts)
+    total = sum(p["total"] for p in parts)
+    total_sq = sum(p["total_sq"] for p in parts)
+    any_win = sum(p["any_win"] for p in parts)
+    elapsed = time.perf_counter() - started
+
+    cost = len(tickets) * prize.TICKET_PRICE
+    mean = total / draws
+    variance = max(total_sq / draws - mean * mean, 0.0)
+    result = {
+        "draws": draws,
+        "tickets": tickets.tolist(),
+        "cost": cost,
+        "expected_winnings": mean,
+        "expected_net": mean - cost,
+        "expected_roi": (mean - cost) / cost if cost else 0.0,
+        "variance": variance,
+        "std": variance ** 0.5,
+        "win_probability": any_win / draws,
+        "tier_probability": [{str(t): float(row[t] / draws) for t in range(1, 6)} for row in counts],
+        "elapsed": elapsed,
+        "draws_per_sec": draws / elapsed if elapsed else 0.0,
+    }
+    logger.info(f"몬테카를로 시뮬레이션: {draws:,}회 × {len(tickets)}게임, 워커 {max_workers}개, "
+                f"{elapsed:.2f}s ({result['draws_per_sec'] * 60 / 1e6:.1f}M회/분)")
+    return result
+
+def print_report(result):
+    print(f"가상 추첨 {result['draws']:,}회 | 구매 {len(result['tickets'])}게임 ({result['cost']:,}원)")
+    print(f"기대 당첨금 {result['expected_winnings']:,.0f}원 | 기대 순수익 {result['expected_net']:,.0f}원 "
+          f"(ROI {result['expected_roi']:.1%}) | 표준편차 {result['std']:,.0f}원")
+    print(f"한 게임 이상 당첨 확률 {result['win_probability']:.3%}")
+    header = f"{'게임':<24}" + "".join(f"{f'{t}등':>12}" for t in range(1, 6))
+    print(header)
+    print("-" * len(header))
+    for numbers, probs in zip(result['tickets'], result['tier_probability']):
+        print(f"{', '.join(map(str, numbers)):<24}" + "".join(f"{probs[str(t)]:>12.3e}" for t in range(1, 6)))
+
+if __name__ == "__main__":
+    import sys
+    # 사용법: python simulator.py [추첨 횟수] [config 경로]
+    draws = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    config_path = sys.argv[2] if len(sys.argv) > 2 else CONFIG_PATH
+    print_report(simulate(tickets_for(load_games(config_path)), draws))
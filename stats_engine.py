@@ -0,0 +1,138 @@
+import json
+import os
+import threading
+import numpy as np
+from loguru import logger
+from draw_matrix import BASE_DIR, CACHE_DIR_NAME, HISTORY_FILE, load_draw_matrix
+
+# 대시보드/전략이 함께 쓰는 기본 분석 구간 (None = 전체)
+WINDOWS = (10, 50, 100, None)
+SUM_BIN = 10  # 당첨번호 합계 분포 구간 폭 (21~255)
+STATS_VERSION = 1
+STATS_FILE = os.path.join(BASE_DIR, CACHE_DIR_NAME, 'stats.json')
+
+def window_label(window):
+    return "all" if window is None else str(window)
+
+def compute_stats(matrix, windows=WINDOWS):
+    """
+    여러 분석 구간의 통계를 한 번에 계산합니다.
+
+    회차별 특성(번호 one-hot, 홀수 개수, 합계 구간)을 한 번만 만들고 누적합을 구해 두면
+    각 구간 통계는 누적합 끝 - 시작 한 번의 뺄셈이다. (구간 수와 무관하게 이력은 한 번만 훑음)
+    """
+    n = len(matrix)
+    main = matrix.main.astype(np.intp)
+
+    one_hot = np.zeros((n, 45), dtype=np.int32)
+    one_hot[np.arange(n)[:, None], main - 1] = 1
+    odd = (main & 1).sum(axis=1)
+    sums = main.sum(axis=1)
+    sum_bins = sums // SUM_BIN
+    n_sum_bins = 255 // SUM_BIN + 1
+
+    # 세 특성을 한 행렬로 묶어 누적합 한 번
+    features = np.zeros((n, 45 + 7 + n_sum_bins + 1), dtype=np.int64)
+    features[:, :45] = one_hot
+    features[np.arange(n), 45 + odd] = 1
+    features[np.arange(n), 52 + sum_bins] = 1
+    features[:, -1] = sums
+    prefix = np.zeros((n + 1, features.shape[1]), dtype=np.int64)
+    np.cumsum(features, axis=0, out=prefix[1:])
+
+    # 번호별 마지막 출현 위치 → 현재 미출현 간격 (구간과 무관)
+    positions = np.where(one_hot > 0, np.arange(n)[:, None], -1)
+    last_seen = positions.max(axis=0) if n else np.full(45, -1)
+    current_gap = (n - 1 - last_seen).astype(int)
+
+    result = {
+        "version": STATS_VERSION,
+        "latest_drw_no": matrix.latest_drw_no,
+        "draws": n,
+        "current_gap": current_gap.tolist(),
+        "windows": {},
+    }
+    for window in windows:
+        start = 0 if window is None else max(0, n - int(window))
+        span = prefix[n] - prefix[start]
+        size = n - start
+        freq = span[:45]
+        ranking = np.argsort(-freq, kind='stable')
+        window_sums = sums[start:]
+        histogram = span[52:52 + n_sum_bins]
+        result["windows"][window_label(window)] = {
+            "draws": int(size),
+            "frequency": freq.tolist(),
+            "ranking": (ranking + 1).tolist(),
+            "hot": sorted((ranking[:6] + 1).tolist()),
+            "cold": sorted((ranking[::-1][:6] + 1).tolist()),
+            "unseen": [int(i) + 1 for i in np.flatnonzero(freq == 0)],
+            "parity": span[45:52].tolist(),  # 인덱스 = 홀수 개수 (0~6)
+            "sum": {
+                "mean": float(span[-1] / size) if size else 0.0,
+                "std": float(window_sums.std()) if size else 0.0,
+                "min": int(window_sums.min()) if size else 0,
+                "max": int(window_sums.max()) if size else 0,
+                "histogram": {f"{b * SUM_BIN}-{b * SUM_BIN + SUM_BIN - 1}": int(c)
+                              for b, c in enumerate(histogram) if c},
+            },
+        }
+    return result
+
+class StatsEngine:
+    """
+    다중 구간 통계 캐시. 최신 회차(drwNo)가 바뀔 때만 다시 계산하고,
+    결과를 data_cache/stats.json에 저장해 봇/대시보드 프로세스가 함께 재사용한다.
+    """
+    def __init__(self, csv_path=HISTORY_FILE, cache_file=STATS_FILE):
+        self.csv_path = csv_path
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._stats = None
+
+    def _key(self, matrix):
+        return [STATS_VERSION, matrix.latest_drw_no, len(matrix)]
+
+    def _load_file(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_file(self, stats):
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        tmp_path = self.cache_file + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_file)
+
+    def get(self):
+        """최신 이력 기준 통계 dict. 같은 회차 기준으로 이미 계산된 것이 있으면 그대로 반환."""
+        matrix = load_draw_matrix(self.csv_path)
+        key = self._key(matrix)
+        with self._lock:
+            if self._stats is not None and self._stats.get("key") == key:
+                return self._stats
+            stats = self._load_file()
+            if stats is None or stats.get("key") != key:
+                stats = compute_stats(matrix)
+                stats["key"] = key
+                try:
+                    self._save_file(stats)
+                except OSError as e:
+                    logger.warning(f"통계 캐시 저장 실패: {e}")
+                logger.info(f"다중 구간 통계 계산 완료: {matrix.latest_drw_no}회 기준 "
+                            f"{', '.join(window_label(w) for w in WINDOWS)}")
+            self._stats = stats
+            return stats
+
+    def window(self, analysis_range):
+        """analysis_range(10, 50, 100, 'all')에 해당하는 구간 통계. 기본 구간이 아니면 None."""
+        label = "all" if not str(analysis_range).isdigit() else str(int(analysis_range))
+        return self.get()["windows"].get(label)
+
+stats_engine = StatsEngine()
+
+if __name__ == "__main__":
+    print(json.dumps(stats_engine.get(), ensure_ascii=False, indent=2))
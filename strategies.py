@@ -1,17 +1,19 @@
 import random
-import requests
-from collections import Counter
 from loguru import logger
+import ticket_codec
 from datetime import datetime
 
-def generate_numbers(mode, manual_numbers=None, analysis_range=50):
+def generate_numbers(mode, manual_numbers=None, analysis_range=50, game=None):
     """
     모드에 따라 6개의 로또 번호를 생성하여 반환합니다.
     
     Args:
-        mode (str): 'auto', 'manual', 'semi_auto', 'ai', 'max_first'
+        mode (str): 'auto', 'manual', 'semi_auto', 'ai', 'max_first', 'filtered', 'pair', 'anti_pair',
+                    'cold', 'overdue', 'wheel', 'markov', 'ensemble'
         manual_numbers (list): 수동/반자동 모드일 때 사용자가 입력한 번호 리스트
-        analysis_range (int/str): 'max_first' 모드에서 분석할 최근 회차 수 (10, 50, 100, 'all')
+        analysis_range (int/str): 'max_first'/'pair'/'anti_pair' 모드에서 분석할 최근 회차 수 (10, 50, 100, 'all')
+        game (dict): config.json의 게임 설정 전체 (모드별 추가 옵션, 예: 'filtered'의 'filters',
+                     'wheel'의 'wheel_source'/'wheel_pool', 'ensemble'의 가중치)
         
     Returns:
         list: 6개의 정수 리스트 (1~45). 'auto' 모드인 경우 None 반환 가능 (사이트 자동선택 사용 시)
@@ -44,31 +46,59 @@ def generate_numbers(mode, manual_numbers=None, analysis_range=50):
         
     elif mode == 'max_first':
         return get_max_first_numbers(analysis_range)
+    
+    elif mode == 'filtered':
+        return get_filtered_numbers((game or {}).get('filters', DEFAULT_FILTERS))
+    
+    elif mode == 'pair':
+        ranking = get_number_ranking('pair', analysis_range)
+        return sorted(ranking[:6]) if ranking else get_random_numbers()
+    
+    elif mode == 'anti_pair':
+        return get_anti_pair_numbers(analysis_range)
+    
+    elif mode == 'markov':
+        ranking = get_number_ranking('markov')
+        if not ranking:
+            return get_random_numbers()
+        numbers = sorted(ranking[:6])
+        logger.info(f"전이 행렬 예측 번호: {numbers}")
+        return numbers
+    
+    elif mode == 'ensemble':
+        return get_ensemble_tickets(game or {'analysis_range': analysis_range}, 1)[0]
+    
+    elif mode == 'wheel':
+        return get_wheel_tickets(game or {'analysis_range': analysis_range}, 1)[0]
+    
+    elif mode in ('cold', 'overdue'):
+        ranking = get_number_ranking(mode)
+        if not ranking:
+            return get_random_numbers()
+        numbers = sorted(ranking[:6])
+        logger.info(f"{mode} 번호 (미출현 간격 기준): {numbers}")
+        return numbers
         
     else:
         logger.warning(f"알 수 없는 모드: {mode}. 랜덤 번호를 반환합니다.")
         return get_random_numbers()
 
-def predict_ai_numbers():
+def predict_ai_scores():
     """
-    학습된 LSTM 모델을 사용하여 번호를 예측합니다.
+    학습된 LSTM 모델로 다음 회차의 번호별(1~45) 확률 벡터를 예측합니다.
+    모델 파일이 없거나 최근 데이터가 부족하면 None을 반환합니다.
     """
     import numpy as np
-    from tensorflow.keras.models import load_model
-    import os
+    from model_cache import model_cache, predict_ai
     
-    model_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lotto_model.h5")
-    if not os.path.exists(model_path):
+    if not model_cache.exists():
         logger.warning("모델 파일(lotto_model.h5)이 없습니다. AI 추천 대신 랜덤 번호를 사용합니다.")
         try:
             from notification import send_discord_message
             send_discord_message("⚠️ AI 모델(lotto_model.h5)이 없어 'AI 추천'이 랜덤으로 대체됩니다. (train_model.py로 학습 필요)")
         except Exception:
             pass
-        return get_random_numbers()
-    
-    logger.info("AI 모델 로드 중...")
-    model = load_model(model_path)
+        return None
     
     # 최근 10회차 데이터 가져오기 (학습 시 window_size=10 사용 가정)
     window_size = 10
@@ -76,8 +106,8 @@ def predict_ai_numbers():
     
     if len(recent_numbers) < window_size:
         logger.warning("최근 데이터가 부족하여 AI 예측을 할 수 없습니다.")
-        return get_random_numbers()
-        
+        return None
+    
     # 전처리 (One-hot encoding)
     def to_one_hot(nums):
         one_hot = np.zeros(45)
@@ -88,40 +118,30 @@ def predict_ai_numbers():
     input_seq = np.array([to_one_hot(nums) for nums in recent_numbers])
     input_seq = input_seq.reshape(1, window_size, 45) # (1, 10, 45)
     
-    # 예측
-    prediction = model.predict(input_seq, verbose=0)[0] # (45,)
+    # 예측 (기본은 TensorFlow 없는 NumPy 순전파, 모델은 프로세스당 한 번만 로드해 재사용)
+    prediction = predict_ai(input_seq)
+    return None if prediction is None else prediction[0] # (45,)
+
+def predict_ai_numbers():
+    """
+    학습된 LSTM 모델을 사용하여 번호를 예측합니다.
+    """
+    ranking = get_number_ranking('ai')
+    if ranking is None:
+        return get_random_numbers()
     
     # 확률이 높은 상위 6개 선택
-    # argsort는 오름차순이므로 뒤에서 6개 자르고 뒤집음
-    top_indices = prediction.argsort()[-6:][::-1]
-    
-    # 인덱스(0~44)를 번호(1~45)로 변환
-    predicted_numbers = sorted([i + 1 for i in top_indices])
+    predicted_numbers = sorted(ranking[:6])
     
-    logger.info(f"AI 예측 번호: {predicted_numbers}")
+    logger.info(f"AI 예측 번호 ({_ai_model_version()}): {predicted_numbers}")
     return predicted_numbers
 
 def get_recent_draws(count):
-    """최근 N회차의 당첨 번호를 가져옵니다."""
-    # analysis.py의 fetch_lotto_data 재사용 또는 직접 구현
-    # 여기서는 strategies.py 내의 fetch_lotto_numbers 사용
-    
-    latest_drw = get_latest_drw_no()
-    results = []
-    
-    # 최신 회차부터 역순으로 N개 수집
-    # 주의: 최신 회차가 아직 추첨 안 됐을 수도 있으니 확인 필요하지만
-    # get_latest_drw_no는 날짜 기준 계산이므로 추첨일(토요일) 지나면 증가함.
-    # 안전하게 최신부터 과거로 가면서 데이터 있는 것만 수집
-    
-    current = latest_drw
-    while len(results) < count and current > 0:
-        nums = fetch_lotto_numbers(current)
-        if nums:
-            results.insert(0, nums) # 과거 데이터를 앞에 추가 (시계열 순서 유지)
-        current -= 1
-        
-    return results
+    """최근 N회차의 당첨 번호를 가져옵니다. (과거 → 최신 순서)"""
+    # 로컬 당첨번호 저장소(lotto_history.csv)에서 바로 읽음 — 네트워크 호출 없음.
+    # 새 회차 반영은 스케줄러의 동기화 작업(draw_store.sync)이 담당한다.
+    from draw_store import draw_store
+    return draw_store.recent_numbers(count)
 
 def get_random_numbers(count=6, exclude=None):
     """1~45 사이의 중복 없는 랜덤 번호를 반환합니다."""
@@ -138,43 +158,10 @@ def get_max_first_numbers(range_val):
         limit = int(range_val) if str(range_val).isdigit() else 99999
         logger.info(f"최근 {limit}회차 당첨 번호 분석 중...")
         
-        # 동행복권 사이트에서 당첨번호 크롤링 (또는 API 사용)
-        # 여기서는 간단하게 최근 회차부터 역순으로 조회한다고 가정
-        # 실제로는 별도의 크롤러가 필요하지만, requests로 간단히 구현 시도
-        
-        # 동행복권 당첨결과 페이지 (iframe 아님)
-        # https://dhlottery.co.kr/gameResult.do?method=byWin
-        
-        # API가 없으므로, drwNo(회차)를 역순으로 순회하며 조회해야 함.
-        # 하지만 매번 100번씩 요청하면 느리므로, 최근 100회차 통계가 있는 페이지를 찾거나
-        # 미리 수집된 데이터를 사용하는 것이 좋음.
-        
-        # 대안: 동행복권은 '기간별 미출현 번호' 등 통계 페이지를 제공함.
-        # https://dhlottery.co.kr/gameResult.do?method=statByNumber
-        # 이 페이지를 파싱하는 것이 효율적임.
-        
-        # 하지만 구현의 복잡도를 낮추기 위해, 여기서는 "가장 최근 회차"를 먼저 알아내고
-        # 거기서부터 N회차 전까지 루프를 돌며 API를 호출하는 방식을 사용 (공식 API는 아니지만 내부 API 존재 가능성)
-        
-        # 동행복권 공식 API (비공식적으로 알려진)
-        # https://www.dhlottery.co.kr/common.do?method=getLottoNumber&drwNo=1146
-        
-        # 1. 최신 회차 구하기
-        latest_drw_no = get_latest_drw_no()
-        
-        start_drw = max(1, latest_drw_no - limit + 1)
-        end_drw = latest_drw_no
-        
-        number_counts = Counter()
-        
-        for drw_no in range(end_drw, start_drw - 1, -1):
-            numbers = fetch_lotto_numbers(drw_no)
-            if numbers:
-                number_counts.update(numbers)
-            
-        # 가장 많이 나온 번호 6개 추출
-        most_common = number_counts.most_common(6)
-        result = sorted([num for num, count in most_common])
+        # 누적 출현 인덱스에서 최근 N회차 구간 빈도를 벡터 뺄셈 한 번으로 구함 (O(45))
+        # 동률이면 작은 번호 우선. 한 번도 안 나온 번호는 제외
+        from draw_store import draw_store
+        result = sorted(draw_store.frequency_index().top_k(limit))
         
         logger.info(f"분석 결과 (상위 6개): {result}")
         
@@ -190,6 +177,122 @@ def get_max_first_numbers(range_val):
         logger.error(f"번호 분석 실패: {e}")
         return get_random_numbers()
 
+# 'filtered' 모드 기본 조건: 합계 100~175, 홀수 2~4개, 3연번 이상 제외, 3개 이상 번호대, 역대 1등 조합 제외
+DEFAULT_FILTERS = {"sum": [100, 175], "odd": [2, 4], "max_run": 2, "min_decades": 3, "exclude_drawn": True}
+
+def get_filtered_numbers(filters, rng=None, exclude=None):
+    """
+    조건(합계/홀짝/연번/번호대/역대 1등 제외)을 만족하는 전체 조합 중에서 균등하게 1장 뽑습니다.
+    사전 계산된 조합 특성 컬럼을 벡터 필터링하므로 재추첨 루프가 없습니다.
+    exclude(조합 순위 모음)에 든 조합은 뽑지 않으며, 남은 조합이 없으면 랜덤 번호로 대신합니다.
+    """
+    try:
+        from combo_filter import combo_filter
+        import numpy as np
+        rng = rng if rng is not None else np.random.default_rng(random.getrandbits(64))
+        numbers = combo_filter.sample(filters, 1, rng, exclude=exclude)[0].tolist()
+        logger.info(f"조건 필터 추출 번호: {numbers}")
+        return numbers
+    except Exception as e:
+        logger.error(f"조건 필터 추출 실패: {e}")
+        return get_random_numbers()
+
+def get_anti_pair_numbers(range_val, rng=None):
+    """최근 N회차 동안 서로 함께 나온 적이 적은 번호끼리 묶습니다. (쌍 동시 출현 인덱스 사용)"""
+    try:
+        from draw_store import draw_store
+        limit = int(range_val) if str(range_val).isdigit() else None
+        index = draw_store.cooccurrence_index()
+        if len(index) == 0:
+            return get_random_numbers()
+        numbers = index.anti_pair_numbers(limit, rng)
+        logger.info(f"최근 {range_val}회차 비동반 번호: {numbers}")
+        return numbers
+    except Exception as e:
+        logger.error(f"비동반 번호 분석 실패: {e}")
+        return get_random_numbers()
+
+def get_ensemble_tickets(game, count, exclude=None):
+    """
+    'ensemble' 모드: 번호별 신호 벡터(빈도/미출현 간격/쌍 동반/전이 행렬/AI)를 게임 설정의 가중치로
+    합친 45개 점수 하나를 만들고, 거기서 서로 다른 티켓 count장을 뽑습니다.
+
+    게임 설정 예: {"mode": "ensemble", "analysis_range": 50,
+                   "ensemble": {"freq": 1.0, "gap": 0.3, "pair": 0.5, "ai": 0.5, "noise": 1.0}}
+    """
+    import ensemble
+    from draw_store import draw_store
+    weights = {**ensemble.DEFAULT_WEIGHTS, **(game.get('ensemble') or {})}
+    limit = int(game.get('analysis_range', 50)) if str(game.get('analysis_range', 50)).isdigit() else None
+    try:
+        signals = [name for name in ensemble.SIGNALS if float(weights.get(name, 0)) != 0]
+        ai_scores = _memoized(('ai_scores', _ai_model_version()), _predict_ai_scores_safe) if 'ai' in signals else None
+        vectors = ensemble.score_vectors(draw_store, limit, ai_scores, signals)
+        scores = ensemble.combine(vectors, weights)
+        tickets = ensemble.sample_tickets(scores, count, float(weights.get('noise', 1.0)), exclude=exclude)
+    except Exception as e:
+        logger.error(f"앙상블 번호 생성 실패: {e}")
+        return [get_random_numbers() for _ in range(count)]
+    logger.info(f"앙상블 ({', '.join(f'{k}={weights[k]}' for k in weights if weights[k])}): {tickets}")
+    return tickets
+
+def _predict_ai_scores_safe():
+    try:
+        return predict_ai_scores()
+    except Exception as e:
+        logger.error(f"AI 예측 실패: {e}")
+        return None
+
+def _ai_model_version():
+    """서비스 중인 AI 모델 버전 라벨 (모델이 바뀌면 이번 주 AI 예측 메모도 새로 계산되도록 키에 포함)."""
+    try:
+        from model_cache import ai_model_version
+        return ai_model_version()
+    except Exception:
+        return None
+
+def uses_ai_model(game):
+    """LSTM 모델 예측이 필요한 게임인지 ('ai' 모드, AI 가중치가 있는 앙상블, AI 순위 휠)."""
+    mode = game.get('mode')
+    if mode == 'ai':
+        return True
+    if mode == 'ensemble' and float((game.get('ensemble') or {}).get('ai', 0)) != 0:
+        return True
+    return mode == 'wheel' and game.get('wheel_source') == 'ai'
+
+def _ticket_model(game):
+    """AI 예측으로 만든 티켓이면 그 모델 버전 라벨 (예측 실패로 대체 번호를 쓴 경우는 None)."""
+    if not uses_ai_model(game):
+        return None
+    version = _ai_model_version()
+    return version if (_data_week(), 'ai_scores', version) in _analysis_cache else None
+
+def get_wheel_tickets(game, count, exclude=None):
+    """
+    'wheel' 모드: 한 전략의 상위 번호 풀(기본 max_first 상위 15개)에서 count장을 골라
+    번호가 최대한 겹치지 않게(풀 내부 3개 조합 커버리지 최대) 배치합니다.
+
+    게임 설정: 'wheel_source' (순위 모드, 기본 'max_first'), 'wheel_pool' (풀 크기, 기본 15),
+    'analysis_range' (순위 모드의 분석 범위)
+    """
+    import wheel
+    source = game.get('wheel_source', 'max_first')
+    pool_size = int(game.get('wheel_pool', wheel.DEFAULT_POOL_SIZE))
+    ranking = get_number_ranking(source, game.get('analysis_range', 50))
+    if not ranking:
+        logger.warning(f"휠 후보 순위({source})를 만들 수 없어 랜덤 풀을 사용합니다.")
+        ranking = get_random_numbers(45)
+        random.shuffle(ranking)
+    try:
+        tickets = wheel.build_wheel(ranking[:pool_size], count, exclude)
+    except Exception as e:
+        logger.error(f"휠 생성 실패: {e}")
+        return [get_random_numbers() for _ in range(count)]
+    covered = wheel.coverage(tickets, ranking[:pool_size])
+    logger.info(f"휠 ({source} 상위 {pool_size}개 풀, {count}장): {tickets} "
+                f"(풀 3개 조합 커버 {covered['triples']:.1%}, 번호 {covered['distinct_numbers']}개)")
+    return tickets
+
 def get_latest_drw_no():
     """현재 최신 회차 번호를 계산합니다."""
     # 로또 1회차: 2002-12-07
@@ -199,21 +302,190 @@ def get_latest_drw_no():
     diff = now - start_date
     return diff.days // 7 + 1
 
+# 이번 주(저장소 최신 회차 기준) 분석 결과 메모이제이션.
+# 같은 설정의 게임이 여러 개여도 분석은 한 번만 수행하고, 새 회차가 들어오면 자동으로 무효화된다.
+_analysis_cache = {}
+
+# 45개 번호 전체 순위를 만들 수 있는 모드 (배치 내 중복 시 다음 순위 번호로 분산)
+RANKED_MODES = ('max_first', 'ai', 'pair', 'cold', 'overdue', 'markov')
+
+def _data_week():
+    """분석 기준 회차 (저장소의 최신 회차 번호, 없으면 0)."""
+    from draw_store import draw_store
+    drw_nos = draw_store.frequency_index().drw_nos
+    return int(drw_nos[-1]) if len(drw_nos) else 0
+
+def _memoized(key, compute):
+    full_key = (_data_week(),) + key
+    if full_key not in _analysis_cache:
+        for stale in [k for k in _analysis_cache if k[0] != full_key[0]]:
+            del _analysis_cache[stale]
+        value = compute()
+        if value is None:
+            # 실패(모델 없음 등)는 기억하지 않음 — 다음 호출 때 다시 시도
+            return None
+        _analysis_cache[full_key] = value
+    return _analysis_cache[full_key]
+
+def get_number_ranking(mode, analysis_range=50):
+    """
+    순위 기반 모드('max_first', 'ai', 'pair', 'cold', 'overdue', 'markov')의 45개 번호 전체 순위 (선호도 내림차순).
+    순위를 만들 수 없으면(AI 모델 없음 등) None.
+    """
+    if mode == 'max_first':
+        limit = int(analysis_range) if str(analysis_range).isdigit() else None
+        def compute():
+            # 기본 구간(10/50/100/전체)은 대시보드와 같은 통계 캐시를 재사용
+            from stats_engine import stats_engine
+            window = stats_engine.window(analysis_range)
+            if window is not None:
+                return window["ranking"]
+            from draw_store import draw_store
+            return draw_store.frequency_index().ranking(limit)
+        return _memoized(('max_first', limit), compute)
+    
+    if mode == 'pair':
+        limit = int(analysis_range) if str(analysis_range).isdigit() else None
+        def compute():
+            from draw_store import draw_store
+            index = draw_store.cooccurrence_index()
+            return index.pair_ranking(limit) if len(index) else None
+        return _memoized(('pair', limit), compute)
+    
+    if mode in ('cold', 'overdue'):
+        def compute():
+            from draw_store import draw_store
+            index = draw_store.gap_index()
+            if len(index) == 0:
+                return None
+            return index.cold_ranking() if mode == 'cold' else index.overdue_ranking()
+        return _memoized((mode,), compute)
+    
+    if mode == 'markov':
+        def compute():
+            from draw_store import draw_store
+            model = draw_store.markov_model()
+            return model.ranking() if len(model) else None
+        return _memoized(('markov',), compute)
+    
+    if mode == 'ai':
+        version = _ai_model_version()
+        def compute():
+            # 예측 벡터는 앙상블 모드와 공유 (이번 주 한 번만 예측)
+            scores = _memoized(('ai_scores', version), _predict_ai_scores_safe)
+            if scores is None:
+                return None
+            # argsort는 오름차순이므로 뒤집어서 확률 높은 순
+            return [int(i) + 1 for i in scores.argsort()[::-1]]
+        return _memoized(('ai', version), compute)
+    
+    return None
+
+def parse_numbers(numbers_str):
+    """config.json의 'numbers' 문자열("1, 2, 3")을 정수 리스트로 변환합니다."""
+    if not numbers_str:
+        return []
+    if isinstance(numbers_str, list):
+        return [int(n) for n in numbers_str]
+    return [int(n.strip()) for n in str(numbers_str).split(',') if n.strip()]
+
+def _diversify_from_ranking(ranking, used):
+    """
+    순위 상위 6개가 이미 배치에 있으면, 결정적 규칙으로 다른 조합을 만든다:
+    상위 5개는 유지하고 6번째 자리를 순위 7위, 8위, ... 번호로 차례대로 바꿔본다.
+    그래도 모두 겹치면 상위 4개 + (5~45위 중 2개) 순으로 넓혀 간다.
+    """
+    from itertools import combinations
+    for keep in range(6, 0, -1):
+        head = ranking[:keep - 1] if keep > 1 else []
+        for tail in combinations(ranking[len(head):], 6 - len(head)):
+            ticket = sorted(head + list(tail))
+            if ticket_codec.rank(ticket) not in used:
+                return ticket
+    return sorted(ranking[:6])
+
+def generate_batch(games_config):
+    """
+    활성 게임 전체의 번호를 한 번에 생성합니다.
+
+    - 같은 분석(예: 같은 analysis_range의 max_first)은 이번 주 동안 한 번만 계산해 재사용
+    - 배치 안에서 번호가 겹치지 않도록 결정적으로 분산 (순위 모드는 다음 순위 번호로 교체,
+      랜덤 계열은 회차·게임 순서로 시드를 고정해 재추첨). 수동 번호는 사용자가 고른 그대로 둔다.
+
+    Args:
+        games_config (list): config.json의 'games' 항목 (활성 게임만 넘기는 것을 권장)
+
+    Returns:
+        list[dict]: 게임 순서대로 {"id", "mode", "numbers"} (numbers가 None이면 사이트 자동선택).
+            AI 예측으로 만든 티켓에는 모델 버전 "model" (예: "v3")이 붙는다.
+    """
+    week = _data_week()
+    results = [None] * len(games_config)
+    used = set()
+    
+    # 'wheel' 게임들은 서로 겹치지 않도록 한 번에 배치 (설정은 첫 번째 wheel 게임 기준).
+    # 다른 게임을 모두 뽑은 뒤에 채워야 휠 티켓이 그 번호들과 겹치지 않는다.
+    wheel_slots = [slot for slot, g in enumerate(games_config) if g.get('mode') == 'wheel']
+    other_slots = [slot for slot, g in enumerate(games_config) if g.get('mode') != 'wheel']
+    wheel_queue = None
+    
+    for slot in other_slots + wheel_slots:
+        game = games_config[slot]
+        mode = game.get('mode')
+        analysis_range = game.get('analysis_range', 50)
+        try:
+            manual_numbers = parse_numbers(game.get('numbers', ''))
+        except ValueError:
+            logger.warning(f"Game {game.get('id')}: 번호 형식이 잘못되었습니다. ({game.get('numbers')})")
+            manual_numbers = []
+        
+        if mode == 'wheel' and wheel_queue is None:
+            wheel_queue = get_wheel_tickets(game, len(wheel_slots), set(used))
+        if mode == 'wheel' and wheel_queue:
+            numbers = wheel_queue.pop(0)
+        elif mode == 'ensemble':
+            numbers = get_ensemble_tickets(game, 1, used)[0]
+        elif mode in RANKED_MODES:
+            ranking = get_number_ranking(mode, analysis_range)
+            numbers = _diversify_from_ranking(ranking, used) if ranking else get_random_numbers()
+        else:
+            numbers = generate_numbers(mode, manual_numbers, analysis_range, game)
+        
+        # 중복 판정은 조합 순위(int) 비교로 처리
+        if numbers and len(numbers) == 6 and mode != 'manual' and ticket_codec.rank(numbers) in used:
+            rng = random.Random(f"{week}-{slot}")
+            if mode == 'filtered':
+                # 이미 쓴 조합을 뺀 후보에서 한 번에 다시 뽑는다 (조건을 만족하는 조합이 바닥나면 랜덤으로 대체)
+                import numpy as np
+                filters = game.get('filters', DEFAULT_FILTERS)
+                numbers = get_filtered_numbers(filters, np.random.default_rng(rng.getrandbits(64)), exclude=used)
+            while ticket_codec.rank(numbers) in used:
+                numbers = sorted(rng.sample(range(1, 46), 6))
+        
+        if numbers and len(numbers) == 6:
+            used.add(ticket_codec.rank(numbers))
+        ticket = {"id": game.get('id'), "mode": mode, "numbers": numbers}
+        model = _ticket_model(game)
+        if model:
+            ticket["model"] = model
+        results[slot] = ticket
+    
+    return results
+
 def fetch_lotto_numbers(drw_no):
     """특정 회차의 당첨 번호를 가져옵니다."""
-    url = f"https://www.dhlottery.co.kr/common.do?method=getLottoNumber&drwNo={drw_no}"
-    try:
-        res = requests.get(url, timeout=3)
-        data = res.json()
-        if data.get("returnValue") == "success":
-            numbers = []
-            for i in range(1, 7):
-                numbers.append(data.get(f"drwtNo{i}"))
-            return numbers
-        else:
-            return None
-    except Exception:
-        return None
+    # 1. 로컬 저장소 우선
+    from draw_store import draw_store
+    numbers = draw_store.get_numbers(drw_no)
+    if numbers:
+        return numbers
+
+    # 2. 저장소에 없는 회차(아직 동기화 전)만 사이트에서 조회 (공용 세션 재사용)
+    from draw_api import fetch_draw
+    data = fetch_draw(drw_no)
+    if data:
+        return [data[f"num{i}"] for i in range(1, 7)]
+    return None
 
 if __name__ == "__main__":
     # 테스트
@@ -0,0 +1,136 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from loguru import logger
+from draw_matrix import HISTORY_FILE, DrawMatrix, load_draw_matrix
+from freq_index import FrequencyIndex
+import backtest
+
+# 기본 탐색 격자
+DEFAULT_WINDOWS = [5, 10, 20, 30, 50, 75, 100, 150, 200, 300, 500, "all"]
+DEFAULT_TIE_BREAKS = ["low", "high", "recent", "random"]
+# 주당 5게임 중 max_first 게임 수 (나머지는 랜덤)
+DEFAULT_MIXES = [5, 4, 3, 2, 1]
+GAMES_PER_WEEK = 5
+
+# --- 워커 프로세스 상태 (initializer에서 공유 메모리에 연결) ---
+_shm = None
+_matrix = None
+_index = None
+
+def _share_array(arr):
+    """배열을 공유 메모리 블록에 복사하고 (블록, 메타) 를 반환합니다."""
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+    return shm, (shm.name, arr.shape, arr.dtype.str)
+
+def _attach_array(meta):
+    name, shape, dtype = meta
+    # 풀 워커는 부모의 resource_tracker를 공유하므로 블록 정리(unlink)는 부모가 한 번만 수행한다
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+def _init_worker(numbers_meta, drw_nos_meta):
+    """워커마다 한 번: 공유 메모리의 당첨번호를 복사 없이 붙이고 누적 인덱스를 만든다."""
+    global _shm, _matrix, _index
+    shm_numbers, numbers = _attach_array(numbers_meta)
+    shm_drw, drw_nos = _attach_array(drw_nos_meta)
+    _shm = (shm_numbers, shm_drw)
+    from draw_matrix import numbers_to_masks
+    _matrix = DrawMatrix(drw_nos, None, numbers, numbers_to_masks(numbers[:, :6]))
+    _index = FrequencyIndex.from_matrix(_matrix)
+
+def _score_point(point, start, seed):
+    """
+    한 파라미터 조합의 워크포워드 점수.
+    매 회차 이전 이력만으로 max_first 게임 mix개 + 랜덤 게임 (5 - mix)개를 구매했다고 보고 채점한다.
+    """
+    positions = np.arange(start, len(_matrix))
+    rng = np.random.default_rng(seed)
+    game = {"mode": "max_first", "analysis_range": point["window"], "tie_break": point["tie_break"]}
+    tiers = []
+    if point["mix"] > 0:
+        # 같은 설정의 max_first 게임은 같은 번호이므로 mix배로 계산
+        max_first = backtest.replay(_matrix, _index, positions, game, rng)
+        tiers.append(np.repeat(max_first[:, None], point["mix"], axis=1))
+    for _ in range(GAMES_PER_WEEK - point["mix"]):
+        tiers.append(backtest.replay(_matrix, _index, positions, {"mode": "random"}, rng)[:, None])
+    tiers = np.concatenate(tiers, axis=1)
+
+    result = backtest.summarize(point_label(point), tiers)
+    result.update(point)
+    return result
+
+def _score_chunk(points, start, seed):
+    return [_score_point(p, start, seed) for p in points]
+
+def point_label(point):
+    return f"w={point['window']} tie={point['tie_break']} mix={point['mix']}/{GAMES_PER_WEEK}"
+
+def build_grid(windows=None, tie_breaks=None, mixes=None):
+    """파라미터 격자. max_first 게임이 없는 조합(mix=0)은 window/tie와 무관하므로 한 번만 넣는다."""
+    grid = []
+    seen_all_random = False
+    for window, tie_break, mix in itertools.product(windows or DEFAULT_WINDOWS,
+                                                    tie_breaks or DEFAULT_TIE_BREAKS,
+                                                    DEFAULT_MIXES if mixes is None else mixes):
+        if mix == 0:
+            if seen_all_random:
+                continue
+            seen_all_random = True
+        grid.append({"window": window, "tie_break": tie_break, "mix": mix})
+    return grid
+
+def run_sweep(grid=None, csv_path=HISTORY_FILE, start=backtest.AI_WINDOW_SIZE, max_workers=None,
+              chunk_size=4, seed=0):
+    """
+    파라미터 격자를 ProcessPoolExecutor로 나눠 백테스트하고 ROI 순으로 정렬한 표를 반환합니다.
+    당첨번호 이력은 공유 메모리로 한 번만 올리고 워커는 복사 없이 붙어서 사용한다.
+
+    Args:
+        grid (list[dict]): {"window", "tie_break", "mix"} 리스트 (기본 build_grid())
+        max_workers (int): 워커 수 (기본 CPU 코어 수)
+        chunk_size (int): 워커 작업 1건당 조합 수
+    """
+    grid = grid or build_grid()
+    matrix = load_draw_matrix(csv_path)
+    numbers = np.ascontiguousarray(matrix.numbers)
+    drw_nos = np.ascontiguousarray(matrix.drw_nos)
+    max_workers = max_workers or os.cpu_count() or 1
+    started = time.perf_counter()
+
+    shm_numbers, numbers_meta = _share_array(numbers)
+    shm_drw, drw_nos_meta = _share_array(drw_nos)
+    try:
+        chunks = [grid[i:i + chunk_size] for i in range(0, len(grid), chunk_size)]
+        results = []
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(numbers_meta, drw_nos_meta)) as executor:
+            futures = [executor.submit(_score_chunk, chunk, start, seed) for chunk in chunks]
+            for future in futures:
+                results.extend(future.result())
+    finally:
+        for shm in (shm_numbers, shm_drw):
+            shm.close()
+            shm.unlink()
+
+    results.sort(key=lambda r: (r["roi"], r["hit_rate"]), reverse=True)
+    for rank, r in enumerate(results, 1):
+        r["rank"] = rank
+    logger.info(f"파라미터 탐색 완료: {len(grid)}개 조합, 워커 {max_workers}개, "
+                f"{time.perf_counter() - started:.2f}s")
+    return results
+
+def print_ranking(results, top=20):
+    header = f"{'순위':>4}  {'조합':<32}{'4등':>6}{'5등':>6}{'적중률':>9}{'ROI':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results[:top]:
+        t = r["tiers"]
+        print(f"{r['rank']:>4}  {r['strategy']:<32}{t['4']:>6}{t['5']:>6}{r['hit_rate']:>9.2%}{r['roi']:>9.1%}")
+
+if __name__ == "__main__":
+    print_ranking(run_sweep())
@@ -0,0 +1,50 @@
+import numpy as np
+
+# 6/45 조합을 [0, 8,145,060) 정수 하나로 표현하는 조합 수 체계(combinatorial number system) 코덱.
+# 오름차순 0-기반 번호 c1 < c2 < ... < c6 에 대해 rank = Σ C(c_i, i)  (colex 순서)
+# 티켓 저장/중복 제거/해싱/균등 추출을 모두 int32 연산으로 처리할 수 있다. (100만 장 = 4MB)
+
+NUMBERS = 45
+PICK = 6
+
+def _binomial_table(n_max, k_max):
+    table = np.zeros((n_max + 1, k_max + 1), dtype=np.int64)
+    table[:, 0] = 1
+    for n in range(1, n_max + 1):
+        for k in range(1, k_max + 1):
+            table[n, k] = table[n - 1, k - 1] + table[n - 1, k]
+    return table
+
+BINOM = _binomial_table(NUMBERS, PICK)
+TOTAL_COMBINATIONS = int(BINOM[NUMBERS, PICK])  # 8,145,060
+
+def rank(tickets):
+    """
+    (T, 6) 번호 배열(1~45, 순서 무관)을 (T,) int32 순위로 변환합니다.
+    1차원 6개짜리 한 장을 넘기면 int 하나를 반환합니다.
+    """
+    arr = np.asarray(tickets)
+    single = arr.ndim == 1
+    c = np.sort(arr.reshape(-1, PICK).astype(np.intp), axis=1) - 1
+    ranks = BINOM[c, np.arange(1, PICK + 1)].sum(axis=1).astype(np.int32)
+    return int(ranks[0]) if single else ranks
+
+def unrank(ranks):
+    """
+    순위 배열(0 ≤ r < 8,145,060)을 (T, 6) uint8 번호 배열(오름차순, 1~45)로 복원합니다.
+    정수 하나를 넘기면 번호 리스트 하나를 반환합니다.
+    """
+    single = np.ndim(ranks) == 0
+    r = np.atleast_1d(np.asarray(ranks, dtype=np.int64)).copy()
+    out = np.empty((len(r), PICK), dtype=np.uint8)
+    for k in range(PICK, 0, -1):
+        # C(c, k) <= r 을 만족하는 가장 큰 c (열은 c에 대해 단조 증가)
+        c = np.searchsorted(BINOM[:, k], r, side='right') - 1
+        out[:, k - 1] = c + 1
+        r -= BINOM[c, k]
+    return out[0].tolist() if single else out
+
+def sample_uniform(count, rng=None):
+    """6/45 전체 조합에서 균등하게 count장을 뽑아 (count, 6) 배열로 반환합니다. (중복 허용)"""
+    rng = rng if rng is not None else np.random.default_rng()
+    return unrank(rng.integers(0, TOTAL_COMBINATIONS, size=count))
@@ -0,0 +1,97 @@
+import json
+import os
+from datetime import datetime, date
+from loguru import logger
+from draw_matrix import BASE_DIR
+
+# 회차별 구매 계획 파일: {"<drwNo>": {"drw_no", "created_at", "data_drw_no", "games_key", "tickets"}}
+PLAN_FILE = os.path.join(BASE_DIR, 'ticket_plan.json')
+MAX_GAMES = 5        # 로또 6/45 1회 구매 상한 (buy_games와 동일)
+KEEP_PLANS = 4       # 파일에 남겨 둘 최근 회차 수
+SALES_CLOSE_HOUR = 20  # 토요일 판매 마감 (이후에는 다음 회차 계획)
+
+def target_drw_no(now=None):
+    """이번에 구매할(아직 추첨 전인) 회차 번호. 토요일은 판매 마감 전까지 당일 회차."""
+    now = now or datetime.now()
+    days = (now.date() - date(2002, 12, 7)).days
+    drw_no = -(-days // 7) + 1  # 다음(또는 오늘) 토요일 회차
+    if days % 7 == 0 and now.hour >= SALES_CLOSE_HOUR:
+        drw_no += 1
+    return drw_no
+
+def purchase_games(games_config):
+    """실제로 구매할 게임 (활성 게임 앞에서부터 최대 MAX_GAMES개)."""
+    return [g for g in games_config if g.get('active', True)][:MAX_GAMES]
+
+def games_key(games):
+    """게임 설정 식별값. 계획 생성 뒤 설정이 바뀌었는지 확인하는 용도."""
+    return json.dumps([{k: v for k, v in g.items() if k != 'active'} for g in games],
+                      sort_keys=True, ensure_ascii=False)
+
+def load_plans(path=PLAN_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"구매 계획 파일 읽기 실패: {e}")
+        return {}
+
+def _save_plans(plans, path=PLAN_FILE):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(plans, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def get_plan(drw_no=None, path=PLAN_FILE):
+    """해당 회차(기본: 이번 구매 회차)의 계획 dict (없으면 None)."""
+    drw_no = drw_no or target_drw_no()
+    return load_plans(path).get(str(drw_no))
+
+def build_plan(games_config, drw_no=None, path=PLAN_FILE):
+    """
+    모든 전략을 미리 실행해 게임별 번호를 확정하고 계획 파일에 저장합니다.
+    (금요일 충전 후 스케줄 실행 — 구매 세션 안에서는 분석/모델 로드를 하지 않기 위함)
+
+    Returns:
+        dict: 저장된 계획
+    """
+    import strategies
+    from draw_store import draw_store
+
+    drw_no = drw_no or target_drw_no()
+    games = purchase_games(games_config)
+    tickets = strategies.generate_batch(games) if games else []
+    plan = {
+        "drw_no": drw_no,
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "data_drw_no": draw_store.latest_drw_no(),
+        "games_key": games_key(games),
+        "tickets": tickets,
+    }
+    plans = load_plans(path)
+    plans[str(drw_no)] = plan
+    for key in sorted(plans, key=int)[:-KEEP_PLANS]:
+        del plans[key]
+    _save_plans(plans, path)
+    logger.info(f"{drw_no}회 구매 계획 저장: {len(tickets)}게임")
+    for t in tickets:
+        model = f", 모델 {t['model']}" if t.get('model') else ""
+        logger.info(f"   - Game {t['id']} ({t['mode']}{model}): {t['numbers'] if t['numbers'] else 'Auto'}")
+    return plan
+
+def planned_tickets(games, drw_no=None, path=PLAN_FILE):
+    """
+    구매 시점용: 이번 회차 계획이 있고 게임 설정이 계획 당시와 같으면 그 티켓 목록을 반환.
+    계획이 없거나 설정이 바뀌었으면 None.
+    """
+    drw_no = drw_no or target_drw_no()
+    plan = get_plan(drw_no, path)
+    if plan is None:
+        logger.warning(f"{drw_no}회 구매 계획이 없습니다.")
+        return None
+    if plan.get("games_key") != games_key(games):
+        logger.warning(f"{drw_no}회 구매 계획 이후 게임 설정이 변경되었습니다. 계획을 사용하지 않습니다.")
+        return None
+    return plan["tickets"]
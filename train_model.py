@@ -1,53 +1,71 @@
-import pandas as pd
 import numpy as np
 import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
-from sklearn.model_selection import train_test_split
+from numpy.lib.stride_tricks import sliding_window_view
 from loguru import logger
+from datetime import datetime
 import os
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(BASE_DIR, "lotto_model.h5")
+WINDOW_SIZE = 10             # 과거 10회차를 보고 다음 회차 예측
+FINETUNE_EPOCHS = 5
+FINETUNE_LEARNING_RATE = 1e-4
+REPLAY_SIZE = 64             # 미세 조정 때 함께 섞는 과거 샘플 수 (망각 방지)
+
 def load_data(filename="lotto_history.csv"):
-    if not os.path.exists(filename):
-        raise FileNotFoundError(f"{filename} not found. Run analysis.py first.")
-    
-    df = pd.read_csv(filename)
-    # Sort by draw number just in case
-    df = df.sort_values('drwNo')
-    return df
+    """
+    당첨번호(보너스 제외)를 drwNo 오름차순 (N, 6) 배열로 반환합니다.
+    CSV를 매번 pandas로 파싱하지 않고 공용 바이너리 캐시(DrawMatrix)를 사용합니다.
+    """
+    from draw_matrix import load_draw_matrix
+    return load_draw_matrix(filename).main
+
+def one_hot_encode(numbers):
+    """(N, 6) 당첨번호 → (N, 45) float32 one-hot. 전체 이력을 한 번만 인코딩한다."""
+    numbers = np.asarray(numbers, dtype=np.intp)
+    one_hot = np.zeros((len(numbers), 45), dtype=np.float32)
+    # 로또 번호는 1부터 시작하므로 -1 해줌
+    one_hot[np.arange(len(numbers))[:, None], numbers - 1] = 1
+    return one_hot
 
-def preprocess_data(df, window_size=5):
+def preprocess_data(numbers, window_size=5):
     """
     데이터를 LSTM 입력 형식으로 변환합니다.
+    numbers: (N, 6) 당첨번호 배열 (load_data 결과)
     X: (Samples, Window_Size, 45) - One-hot encoded input
     y: (Samples, 45) - One-hot encoded output
+
+    one-hot 행렬 위의 sliding_window_view(복사 없는 strided view)이므로
+    회차마다 window_size번 복사되지 않는다. (읽기 전용)
     """
-    numbers = df[['num1', 'num2', 'num3', 'num4', 'num5', 'num6']].values
-    
-    # One-hot encoding (1~45 -> index 0~44)
-    # 로또 번호는 1부터 시작하므로 -1 해줌
-    def to_one_hot(nums):
-        one_hot = np.zeros(45)
-        for n in nums:
-            one_hot[int(n)-1] = 1
-        return one_hot
-
-    X = []
-    y = []
-    
-    for i in range(len(numbers) - window_size):
-        # 입력: 과거 N회차의 당첨 번호 (One-hot)
-        window = numbers[i:i+window_size]
-        x_window = np.array([to_one_hot(n) for n in window])
-        
-        # 출력: 다음 회차 당첨 번호 (One-hot)
-        target = numbers[i+window_size]
-        y_target = to_one_hot(target)
-        
-        X.append(x_window)
-        y.append(y_target)
-        
-    return np.array(X), np.array(y)
+    one_hot = one_hot_encode(numbers)
+    # 입력: 과거 N회차의 당첨 번호 → (Samples, 45, Window) 뷰를 (Samples, Window, 45)로 축만 바꿈
+    X = sliding_window_view(one_hot[:-1], window_size, axis=0).transpose(0, 2, 1)
+    # 출력: 다음 회차 당첨 번호
+    y = one_hot[window_size:]
+    return X, y
+
+def make_dataset(one_hot, window_size, indices, batch_size=32, shuffle=False):
+    """
+    샘플 번호 목록(indices, range 또는 배열)의 tf.data 파이프라인.
+    샘플 i = (one_hot[i:i+window_size], one_hot[i+window_size]).
+    one-hot 행렬 하나만 텐서로 올리고, 창은 배치 단위로 gather해서 만들며 prefetch로 학습과 겹친다.
+    """
+    table = tf.constant(one_hot)
+    offsets = tf.range(window_size, dtype=tf.int64)
+
+    def to_batch(idx):
+        return tf.gather(table, idx[:, None] + offsets), tf.gather(table, idx + window_size)
+
+    indices = np.asarray(indices, dtype=np.int64)
+    dataset = tf.data.Dataset.from_tensor_slices(indices)
+    if shuffle:
+        dataset = dataset.shuffle(len(indices), reshuffle_each_iteration=True)
+    return (dataset.batch(batch_size)
+            .map(to_batch, num_parallel_calls=tf.data.AUTOTUNE)
+            .prefetch(tf.data.AUTOTUNE))
 
 def create_model(window_size):
     model = Sequential([
@@ -62,36 +80,200 @@ def create_model(window_size):
     return model
 
 def train():
+    """
+    전체 학습. 같은 방식으로 두 번 학습한다:
+      - 평가용 모델(gate): 최근 EVAL_DRAWS회차를 빼고 학습 → 승격 평가에만 사용
+      - 서비스용 모델: 마지막 회차까지 전부 학습 → 승격되면 lotto_model.h5가 된다
+    """
     logger.info("데이터 로드 중...")
     try:
-        df = load_data()
+        from draw_matrix import load_draw_matrix
+        matrix = load_draw_matrix()
+        numbers = matrix.main
     except Exception as e:
         logger.error(f"데이터 로드 실패: {e}")
         return
 
-    window_size = 10 # 과거 10회차를 보고 다음 회차 예측
+    window_size = WINDOW_SIZE
     
     logger.info("데이터 전처리 중...")
-    X, y = preprocess_data(df, window_size)
-    logger.info(f"입력 데이터 형상: {X.shape}, 출력 데이터 형상: {y.shape}")
+    one_hot = one_hot_encode(numbers)
+    samples = len(one_hot) - window_size
+    logger.info(f"입력 데이터 형상: {(samples, window_size, 45)}, 출력 데이터 형상: {(samples, 45)}")
     
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.1, shuffle=False)
+    # 평가용 모델: 시간 순서대로 앞 90% 학습 / 뒤 10% 검증 (train_test_split(test_size=0.1, shuffle=False)와 같은 분할)
+    # 승격 평가 구간(최근 EVAL_DRAWS회차)은 항상 검증 쪽에 남긴다
+    import model_registry
+    split = min(samples - int(np.ceil(samples * 0.1)), model_registry.eval_start(matrix) - window_size)
+    train_ds = make_dataset(one_hot, window_size, np.arange(split), batch_size=32, shuffle=True)
+    val_ds = make_dataset(one_hot, window_size, np.arange(split, samples), batch_size=32)
     
-    logger.info("모델 생성 및 학습 시작...")
-    model = create_model(window_size)
+    logger.info("평가용 모델 생성 및 학습 시작...")
+    gate = create_model(window_size)
+    gate_history = gate.fit(
+        train_ds,
+        epochs=100,
+        validation_data=val_ds,
+        verbose=1
+    )
     
-    # 학습
+    logger.info("서비스용 모델 학습 시작 (전체 회차)...")
+    model = create_model(window_size)
     history = model.fit(
-        X_train, y_train,
+        make_dataset(one_hot, window_size, np.arange(samples), batch_size=32, shuffle=True),
         epochs=100,
-        batch_size=32,
-        validation_data=(X_test, y_test),
         verbose=1
     )
     
     logger.info("모델 저장 중...")
-    model.save("lotto_model.h5")
-    logger.success("모델 학습 및 저장 완료: lotto_model.h5")
+    meta = save_model(model, {
+        "mode": "full",
+        "base_version": None,
+        "trained_from": int(matrix.drw_nos[0]),
+        "trained_through": int(matrix.drw_nos[-1]),
+        "data_through": int(matrix.latest_drw_no),
+        "draws": len(matrix),
+        "samples": int(samples),
+        "epochs": 100,
+        "metrics": _fit_metrics(history),
+        "gate": {
+            "trained_through": int(matrix.drw_nos[split - 1 + window_size]),  # 마지막 학습 샘플의 정답 회차
+            "samples": int(split),
+            "metrics": _fit_metrics(gate_history),
+        },
+    }, gate)
+    logger.success(f"모델 학습 완료: {model_registry.version_label(meta['version'])} ({meta['status']})")
+
+def save_model(model, info, gate):
+    """
+    학습한 모델을 보관소(models/)에 새 버전으로 등록하고, 평가용 모델의 워크포워드 평가를 통과하면
+    서비스 모델로 승격합니다. 평가에서 현재 모델보다 나쁘면 후보로만 남고 lotto_model.h5는 그대로다.
+
+    Args:
+        gate: 평가용 Keras 모델, 또는 그대로 재사용할 평가용 모델 파일 경로
+
+    Returns:
+        dict: 새 버전 메타데이터 (status: 'current' 또는 'rejected')
+    """
+    import model_registry
+    model_registry.bootstrap()  # 기존 모델을 비교 기준으로 먼저 등록
+    os.makedirs(model_registry.REGISTRY_DIR, exist_ok=True)
+    tmp_path = os.path.join(model_registry.REGISTRY_DIR, "candidate.tmp.h5")
+    model.save(tmp_path)
+    gate_path = gate
+    if not isinstance(gate, str):
+        gate_path = os.path.join(model_registry.REGISTRY_DIR, "gate.tmp.h5")
+        gate.save(gate_path)
+    meta = model_registry.register(tmp_path, info, gate_path)
+    model_registry.promote(meta["version"])
+    return model_registry.get_meta(meta["version"])
+
+def _fit_metrics(history):
+    """마지막 epoch의 학습/검증 지표."""
+    return {name: float(values[-1]) for name, values in history.history.items() if values}
+
+def _fine_tune_from(path, one_hot, first_new, end, epochs, replay_size, rng):
+    """
+    path의 모델을 정답이 [first_new, end) 위치 회차인 샘플 + 그 이전 과거 샘플 replay_size개로 추가 학습합니다.
+
+    Returns:
+        tuple: (모델, fit history, 새 샘플 번호, 과거 샘플 번호)
+    """
+    from tensorflow.keras.models import load_model
+    # 정답(샘플 i의 다음 회차 = i + WINDOW_SIZE)이 새 회차인 샘플. 과거 샘플은 그 앞에서만 뽑는다
+    new_idx = np.arange(max(0, first_new - WINDOW_SIZE), end - WINDOW_SIZE)
+    old_pool = np.arange(new_idx[0])
+    replay_idx = rng.choice(old_pool, size=min(replay_size, len(old_pool)), replace=False)
+    indices = np.concatenate([new_idx, replay_idx])
+    model = load_model(path, compile=False)
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=FINETUNE_LEARNING_RATE),
+                  loss='binary_crossentropy', metrics=['accuracy'])
+    history = model.fit(make_dataset(one_hot, WINDOW_SIZE, indices, batch_size=32, shuffle=True),
+                        epochs=epochs, verbose=0)
+    return model, history, new_idx, replay_idx
+
+def fine_tune(epochs=FINETUNE_EPOCHS, replay_size=REPLAY_SIZE, seed=None):
+    """
+    기존 모델을 불러와 새로 동기화된 회차가 정답인 샘플만 추가 학습합니다. (전체 재학습 없음)
+    과거 샘플 replay_size개를 무작위로 섞어 넣어 예전 패턴을 잊어버리지 않게 하고,
+    작은 학습률로 몇 epoch만 돌린다.
+
+    서비스용 모델은 마지막 회차까지 추가 학습하고, 평가용 모델은 기반 버전의 평가용 모델을
+    평가 구간(최근 EVAL_DRAWS회차) 직전까지만 같은 방식으로 추가 학습한다. (새 회차가 모두 평가
+    구간 안이면 기반 버전의 평가용 모델을 그대로 쓴다)
+
+    Returns:
+        dict: 새 버전 메타데이터 (새 회차가 없으면 None)
+    """
+    from draw_matrix import load_draw_matrix
+    import model_registry
+
+    if not os.path.exists(MODEL_PATH):
+        logger.warning("기존 모델이 없어 전체 학습을 수행합니다.")
+        train()
+        return model_registry.current_meta()
+
+    model_registry.bootstrap()
+    matrix = load_draw_matrix()
+    info = model_registry.current_meta()
+    through = info.get("trained_through")
+    if not through:
+        # 파일 수정 시각은 체크아웃/배포 시각이라 학습 범위를 알려주지 않는다
+        logger.error("현재 모델의 학습 범위(trained_through)를 알 수 없어 미세 조정을 건너뜁니다. "
+                     "python model_registry.py bootstrap <학습 마지막 회차> 로 등록하세요.")
+        return None
+    through = int(through)
+    first_new = int(np.searchsorted(matrix.drw_nos, through, side='right'))  # 새 회차의 첫 위치
+    if first_new >= len(matrix):
+        logger.info(f"새로 학습할 회차 없음 (모델 학습 범위 ~{through}회). 미세 조정을 건너뜁니다.")
+        return None
+
+    one_hot = one_hot_encode(matrix.main)
+    rng = np.random.default_rng(seed)
+    logger.info(f"미세 조정: 새 회차 {len(matrix) - first_new}개 ({through + 1}~{matrix.latest_drw_no}회), {epochs} epochs")
+    started = datetime.now()
+    model, history, new_idx, replay_idx = _fine_tune_from(MODEL_PATH, one_hot, first_new, len(matrix),
+                                                          epochs, replay_size, rng)
+
+    gate_file, gate_through, _ = model_registry.gate_info(info)
+    gate_through = int(gate_through)
+    gate_first_new = int(np.searchsorted(matrix.drw_nos, gate_through, side='right'))
+    gate_end = model_registry.eval_start(matrix)
+    gate_meta = {"trained_through": gate_through}
+    gate = gate_file
+    if gate_first_new < gate_end:
+        gate, gate_history, gate_idx, gate_replay = _fine_tune_from(gate_file, one_hot, gate_first_new, gate_end,
+                                                                    epochs, replay_size, rng)
+        gate_meta = {
+            "trained_through": int(matrix.drw_nos[gate_end - 1]),
+            "samples": int(len(gate_idx) + len(gate_replay)),
+            "metrics": _fit_metrics(gate_history),
+        }
+    logger.info(f"평가용 모델: ~{gate_meta['trained_through']}회 학습"
+                f"{'' if gate_first_new < gate_end else ' (기반 버전 그대로)'}")
+
+    meta = save_model(model, {
+        "mode": "finetune",
+        "base_version": info.get("version"),
+        "trained_from": int(matrix.drw_nos[new_idx[0]]),
+        "trained_through": int(matrix.drw_nos[-1]),
+        "data_through": int(matrix.latest_drw_no),
+        "draws": len(matrix),
+        "samples": int(len(new_idx) + len(replay_idx)),
+        "replay_samples": int(len(replay_idx)),
+        "epochs": epochs,
+        "metrics": _fit_metrics(history),
+        "gate": gate_meta,
+    }, gate)
+    logger.success(f"미세 조정 완료: {model_registry.version_label(meta['version'])} ({meta['status']}, "
+                   f"기반 {model_registry.version_label(info.get('version'))}), "
+                   f"{(datetime.now() - started).total_seconds():.1f}s")
+    return meta
 
 if __name__ == "__main__":
-    train()
+    import sys
+    # 기본은 전체 학습. 새 회차만 추가 학습은: python train_model.py --finetune
+    if "--finetune" in sys.argv:
+        fine_tune()
+    else:
+        train()
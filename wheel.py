@@ -0,0 +1,102 @@
+import time
+from itertools import combinations
+from math import comb
+import numpy as np
+import ticket_codec
+from draw_matrix import numbers_to_masks
+from prize import popcount64
+
+DEFAULT_POOL_SIZE = 15
+MAX_POOL_SIZE = 20       # C(20, 6) = 38,760 후보 조합까지
+TIME_BUDGET_SEC = 0.5    # 지역 탐색 시간 상한
+
+def _candidate_bitsets(pool_size):
+    """
+    풀 안의 모든 6개 조합(후보 티켓)에 대해, 그 티켓이 포함하는 풀 내부 3개 조합의 비트셋.
+
+    Returns:
+        combos: (C, 6) 풀 인덱스 조합
+        bitsets: (C, W) uint64, 비트 j = j번째 3개 조합(colex 순서)을 포함
+    """
+    combos = np.array(list(combinations(range(pool_size), 6)), dtype=np.intp)
+    words = (comb(pool_size, 3) + 63) // 64
+    # 3개 조합 (a < b < c) 의 colex 순위 = C(a,1) + C(b,2) + C(c,3)
+    binom = ticket_codec.BINOM
+    bitsets = np.zeros((len(combos), words), dtype=np.uint64)
+    for i, j, k in combinations(range(6), 3):
+        bit = binom[combos[:, i], 1] + binom[combos[:, j], 2] + binom[combos[:, k], 3]
+        np.bitwise_or.at(bitsets, (np.arange(len(combos)), bit // 64),
+                         np.left_shift(np.uint64(1), (bit % 64).astype(np.uint64)))
+    return combos, bitsets
+
+def _score(triples, numbers):
+    """(덮은 3개 조합 수, 서로 다른 번호 수) 를 한 정수로 (3개 조합 우선)."""
+    return popcount64(triples).sum(axis=-1).astype(np.int64) * 64 + popcount64(numbers).astype(np.int64)
+
+def build_wheel(pool, count=5, exclude=None, time_budget=TIME_BUDGET_SEC):
+    """
+    후보 번호 풀에서 count장의 티켓을 골라, 풀 내부 3개 조합을 최대한 많이 덮고
+    (→ 당첨번호 중 3개가 덮인 조합에 들어오면 5등 보장) 서로 다른 번호를 최대한 많이 쓰도록 배치합니다.
+
+    탐욕 선택으로 시작한 뒤, 한 장씩 다른 후보로 바꿔 점수가 오르면 교체하는 지역 탐색을 반복한다.
+    모든 점수 계산은 비트셋 OR + popcount 벡터 연산.
+
+    Args:
+        pool (list[int]): 후보 번호 (선호도 순서, 최대 MAX_POOL_SIZE개 사용)
+        count (int): 만들 티켓 수
+        exclude (set[int]): 제외할 조합 순위 (이미 배치에 있는 티켓)
+
+    Returns:
+        list[list[int]]: count장의 오름차순 번호 리스트
+    """
+    pool = np.array(list(dict.fromkeys(int(n) for n in pool))[:MAX_POOL_SIZE], dtype=np.uint8)
+    if len(pool) < 6:
+        raise ValueError(f"휠 후보 번호가 6개보다 적습니다: {pool.tolist()}")
+    combos, triples = _candidate_bitsets(len(pool))
+    tickets = np.sort(pool[combos], axis=1)
+    numbers = numbers_to_masks(tickets)
+    if exclude:
+        keep = ~np.isin(ticket_codec.rank(tickets), list(exclude))
+        tickets, triples, numbers = tickets[keep], triples[keep], numbers[keep]
+    count = min(count, len(tickets))
+
+    # 1) 탐욕: 현재까지 덮은 것에 더했을 때 점수가 가장 큰 후보 (동점이면 풀 앞쪽 = 선호도 높은 조합)
+    chosen = []
+    covered = np.zeros(triples.shape[1], dtype=np.uint64)
+    used_numbers = np.uint64(0)
+    for _ in range(count):
+        scores = _score(triples | covered, numbers | used_numbers)
+        scores[chosen] = -1
+        best = int(np.argmax(scores))
+        chosen.append(best)
+        covered |= triples[best]
+        used_numbers |= numbers[best]
+
+    # 2) 지역 탐색: 한 자리씩 나머지와 합친 점수가 가장 큰 후보로 교체, 개선이 없거나 시간이 다하면 종료
+    deadline = time.perf_counter() + time_budget
+    current = int(_score(covered, used_numbers))
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for slot in range(count):
+            others = [c for i, c in enumerate(chosen) if i != slot]
+            rest_triples = np.bitwise_or.reduce(triples[others], axis=0) if others else np.zeros_like(covered)
+            rest_numbers = np.bitwise_or.reduce(numbers[others]) if others else np.uint64(0)
+            scores = _score(triples | rest_triples, numbers | rest_numbers)
+            scores[others] = -1
+            best = int(np.argmax(scores))
+            if scores[best] > current:
+                chosen[slot] = best
+                current = int(scores[best])
+                improved = True
+        covered = np.bitwise_or.reduce(triples[chosen], axis=0)
+        used_numbers = np.bitwise_or.reduce(numbers[chosen])
+
+    return [tickets[c].tolist() for c in chosen]
+
+def coverage(tickets, pool):
+    """티켓 묶음이 덮는 풀 내부 3개 조합 비율과 서로 다른 번호 수."""
+    pool = set(int(n) for n in pool)
+    triples = {t for ticket in tickets for t in combinations(sorted(set(ticket) & pool), 3)}
+    distinct = set(n for ticket in tickets for n in ticket)
+    return {"triples": len(triples) / comb(len(pool), 3), "distinct_numbers": len(distinct)}